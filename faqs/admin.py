@@ -1,9 +1,33 @@
 from django.contrib import admin
+from django.db import transaction
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.urls import reverse
 from django.utils import timezone
-from .models import FAQ
+from .models import FAQ, FAQSearchDocument, FAQTranslation
+from .services import TranslationService
+
+
+class FAQTranslationInline(admin.StackedInline):
+    model = FAQTranslation
+    extra = 0
+    fields = ['lang', 'question', 'answer', 'translated_at', 'translation_preview']
+    readonly_fields = ['translated_at', 'translation_preview']
+    classes = ['collapse']
+    
+    def translation_preview(self, obj):
+        """Show a preview of the translation"""
+        language = TranslationService.get_languages().get(obj.lang, obj.lang).title()
+        if not obj.question or not obj.answer_html:
+            return f"{language} translation not available"
+        return format_html(
+            '<strong>Question:</strong><br>{}<br><br>'
+            '<strong>Answer:</strong><br>{}',
+            obj.question,
+            mark_safe(obj.answer_html)
+        )
+    translation_preview.short_description = 'Preview'
+
 
 @admin.register(FAQ)
 class FAQAdmin(admin.ModelAdmin):
@@ -20,15 +44,15 @@ class FAQAdmin(admin.ModelAdmin):
         ('last_translated', admin.EmptyFieldListFilter),
         'created_at'
     ]
+    # Searched through the full-text index, see get_search_results()
     search_fields = [
-        'question', 'answer__html',
-        'question_hi', 'answer_hi__html',
-        'question_bn', 'answer_bn__html'
+        'question', 'answer_html',
+        'translations__question', 'translations__answer_html'
     ]
     readonly_fields = [
-        'created_at', 'updated_at', 'last_translated',
-        'translation_preview_hi', 'translation_preview_bn'
+        'created_at', 'updated_at', 'last_translated'
     ]
+    inlines = [FAQTranslationInline]
     actions = ['update_translations', 'toggle_active_status']
     list_per_page = 20
     save_on_top = True
@@ -43,16 +67,6 @@ class FAQAdmin(admin.ModelAdmin):
             'classes': ['collapse'],
             'description': 'Configure automatic translation settings'
         }),
-        ('Hindi Translation', {
-            'fields': ['question_hi', 'answer_hi', 'translation_preview_hi'],
-            'classes': ['collapse'],
-            'description': 'Hindi version of the FAQ'
-        }),
-        ('Bengali Translation', {
-            'fields': ['question_bn', 'answer_bn', 'translation_preview_bn'],
-            'classes': ['collapse'],
-            'description': 'Bengali version of the FAQ'
-        }),
         ('Metadata', {
             'fields': ['created_at', 'updated_at'],
             'classes': ['collapse'],
@@ -92,25 +106,32 @@ class FAQAdmin(admin.ModelAdmin):
         )
     last_translated_display.short_description = 'Translation Age'
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('translations')
+    
+    def get_search_results(self, request, queryset, search_term):
+        """Match the search index in any language instead of scanning text columns"""
+        if not search_term.strip():
+            return queryset, False
+        matches = FAQSearchDocument.objects.search(search_term).values('faq_id')
+        return queryset.filter(pk__in=matches), False
+    
     def translation_status(self, obj):
         """Display translation status with colored indicators"""
         status_html = []
+        translations = {translation.lang: translation for translation in obj.translations.all()}
+        languages = TranslationService.get_languages()
         
-        hi_complete = obj.question_hi and obj.answer_hi
-        hi_status = '✓' if hi_complete else '✗'
-        hi_color = 'green' if hi_complete else 'red'
-        hi_title = 'Hindi translation complete' if hi_complete else 'Hindi translation missing'
-        status_html.append(
-            f'<span title="{hi_title}" style="color: {hi_color};">HI: {hi_status}</span>'
-        )
-        
-        bn_complete = obj.question_bn and obj.answer_bn
-        bn_status = '✓' if bn_complete else '✗'
-        bn_color = 'green' if bn_complete else 'red'
-        bn_title = 'Bengali translation complete' if bn_complete else 'Bengali translation missing'
-        status_html.append(
-            f'<span title="{bn_title}" style="color: {bn_color};">BN: {bn_status}</span>'
-        )
+        for lang in TranslationService.get_target_languages():
+            translation = translations.get(lang)
+            complete = translation and translation.question and translation.answer_html
+            status = '✓' if complete else '✗'
+            color = 'green' if complete else 'red'
+            name = languages[lang].title()
+            title = f'{name} translation complete' if complete else f'{name} translation missing'
+            status_html.append(
+                f'<span title="{title}" style="color: {color};">{lang.upper()}: {status}</span>'
+            )
         
         return format_html(
             '<div style="white-space: nowrap;">{}</div>',
@@ -118,30 +139,6 @@ class FAQAdmin(admin.ModelAdmin):
         )
     translation_status.short_description = 'Translations'
     
-    def translation_preview_hi(self, obj):
-        """Show Hindi translation preview"""
-        if not obj.question_hi or not obj.answer_hi:
-            return "Hindi translation not available"
-        return format_html(
-            '<strong>Question:</strong><br>{}<br><br>'
-            '<strong>Answer:</strong><br>{}',
-            obj.question_hi,
-            mark_safe(obj.answer_hi.html if hasattr(obj.answer_hi, 'html') else obj.answer_hi)
-        )
-    translation_preview_hi.short_description = 'Hindi Preview'
-    
-    def translation_preview_bn(self, obj):
-        """Show Bengali translation preview"""
-        if not obj.question_bn or not obj.answer_bn:
-            return "Bengali translation not available"
-        return format_html(
-            '<strong>Question:</strong><br>{}<br><br>'
-            '<strong>Answer:</strong><br>{}',
-            obj.question_bn,
-            mark_safe(obj.answer_bn.html if hasattr(obj.answer_bn, 'html') else obj.answer_bn)
-        )
-    translation_preview_bn.short_description = 'Bengali Preview'
-    
     def toggle_active_status(self, request, queryset):
         """Toggle active status for selected FAQs"""
         for faq in queryset:
@@ -156,14 +153,15 @@ class FAQAdmin(admin.ModelAdmin):
     
     def update_translations(self, request, queryset):
         """Update translations for selected FAQs"""
-        updated = 0
-        for faq in queryset:
-            if faq.auto_translate:
-                faq.update_translations()
-                faq.save()
-                updated += 1
+        faqs = [faq for faq in queryset if faq.auto_translate]
+        translated = FAQ.update_translations_bulk(faqs)
+        updated = len({faq.pk for faq, _, _ in translated})
+        
+        with transaction.atomic():
+            FAQ.objects.bulk_update(faqs, ['last_translated'])
+            FAQ.save_translations_bulk(faqs)
         
-        skipped = queryset.count() - updated
+        skipped = queryset.count() - len(faqs)
         message = f"Updated translations for {updated} FAQs."
         if skipped:
             message += f" Skipped {skipped} FAQs (auto-translate disabled)."
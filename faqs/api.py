@@ -1,28 +1,134 @@
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
-from django.core.cache import cache
-from django.conf import settings
-from django.core.exceptions import ImproperlyConfigured
-from redis.exceptions import RedisError
-from .models import FAQ
-from .serializers import FAQSerializer, FAQAdminSerializer
+from functools import partial
+from .caching import (
+    cached_build, deferred_invalidation, list_cache_key, memoize_locally, page_cache_key
+)
+from .models import FAQ, FAQSearchDocument
+from .pagination import FAQCursorPagination, FAQSearchPagination
+from .rendering import build_language, build_page, entry_body, list_queryset, render_entry
+from .serializers import FAQSerializer, FAQAdminSerializer, FAQBulkSerializer, FAQListSerializer
+from .services import TranslationService
+from .transfer import FAQImporter, RecordError, chunked, feed_records
+import hashlib
+import json
+import re
+import zlib
+
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+def join_languages(entries: dict) -> dict:
+    """
+    Rendered by_language entry spliced from the per-language entries
+    
+    Only the per-language entries are stored in Redis. The joined entry is
+    kept in this process, keyed by the ETags of its parts.
+    """
+    parts_etag = hashlib.md5(
+        '|'.join(f'{lang}:{entry["etag"]}' for lang, entry in entries.items()).encode()
+    ).hexdigest()
+    
+    def join():
+        parts = [
+            json.dumps(lang).encode() + b':' + entry_body(entry) for lang, entry in entries.items()
+        ]
+        return render_entry(b'{' + b','.join(parts) + b'}')
+    
+    return memoize_locally(f'faq_list:all_languages:{parts_etag}', join)
+
+
+def cached_response(request, entry: dict) -> HttpResponse:
+    """
+    Serve a rendered entry as is, or 304 if the client already has it
+    
+    Each encoding gets its own strong ETag, as the bytes differ.
+    """
+    use_gzip = entry['gzip'] is not None and ACCEPTS_GZIP.search(
+        request.META.get('HTTP_ACCEPT_ENCODING', '')
+    )
+    etag = f'"{entry["etag"]}-gzip"' if use_gzip else f'"{entry["etag"]}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(
+            entry['gzip'] if use_gzip else entry_body(entry), content_type='application/json'
+        )
+        if use_gzip:
+            response['Content-Encoding'] = 'gzip'
+    response['ETag'] = etag
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def stream_lines(records, batch_size: int, compress: bool = False):
+    """
+    Encode records as JSON lines, batch_size lines per yielded block
+
+    With compress, the blocks form one gzip stream that is flushed after
+    every block, so clients can decode each block as it arrives.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    for batch in chunked(records, batch_size):
+        block = b''.join(
+            json.dumps(record, ensure_ascii=False).encode() + b'\n' for record in batch
+        )
+        if compressor:
+            block = compressor.compress(block) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield block
+    if compressor:
+        yield compressor.flush()
+
 
 class FAQViewSet(viewsets.ModelViewSet):
     """
     API endpoint for FAQs with language support and Redis caching
     """
     queryset = FAQ.objects.filter(is_active=True)
+    pagination_class = FAQCursorPagination
+    
+    def get_queryset(self):
+        """Only load translation rows for the requested language"""
+        queryset = super().get_queryset()
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk']:
+            return queryset
+        language = self.request.query_params.get('lang', 'en')
+        if self.action == 'list':
+            return list_queryset(language, self._get_fields())
+        return queryset.with_language(language)
+    
+    def _get_fields(self):
+        """The ?fields= sparse fieldset of a list request, in FIELDS order, or None"""
+        param = self.request.query_params.get('fields')
+        if not param:
+            return None
+        requested = {name.strip() for name in param.split(',') if name.strip()}
+        unknown = requested - set(FAQListSerializer.FIELDS)
+        if unknown:
+            raise ValidationError({'fields': f"Unknown fields: {', '.join(sorted(unknown))}"})
+        return [name for name in FAQListSerializer.FIELDS if name in requested]
+    
+    def get_serializer(self, *args, **kwargs):
+        if self.action == 'list':
+            kwargs.setdefault('fields', self._get_fields())
+        return super().get_serializer(*args, **kwargs)
     
     def get_serializer_class(self):
         if self.request.user.is_staff and self.action in ['create', 'update', 'partial_update']:
             return FAQAdminSerializer
+        if self.action == 'list':
+            return FAQListSerializer
         return FAQSerializer
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk']:
             permission_classes = [permissions.IsAdminUser]
         else:
             permission_classes = [permissions.AllowAny]
@@ -33,118 +139,140 @@ class FAQViewSet(viewsets.ModelViewSet):
         context['language'] = self.request.query_params.get('lang', 'en')
         return context
     
-    def _get_cache_key_for_list(self, language):
-        """Generate a cache key for the FAQ list in a specific language"""
-        return f'faq_list:{language}'
-    
-    def _get_cache_key_for_languages(self):
-        """Generate a cache key for the by_language view"""
-        return 'faq_list:all_languages'
-    
-    def _safe_cache_get(self, key):
-        """Safely get data from cache, handling potential Redis errors"""
-        try:
-            return cache.get(key)
-        except (RedisError, ImproperlyConfigured):
-            return None
-    
-    def _safe_cache_set(self, key, value, timeout=None):
-        """Safely set data in cache, handling potential Redis errors"""
-        try:
-            timeout = timeout or getattr(settings, 'CACHE_TTL', 60 * 15)
-            cache.set(key, value, timeout=timeout)
-        except (RedisError, ImproperlyConfigured):
-            pass
-    
     def list(self, request, *args, **kwargs):
         """
         List FAQs with language support and Redis caching
-        """
-        language = request.query_params.get('lang', 'en')
-        cache_key = self._get_cache_key_for_list(language)
         
-        # Try to get from cache
-        cached_data = self._safe_cache_get(cache_key)
-        if cached_data is not None:
-            return Response(cached_data)
+        Pages are cached separately by language, cursor, page size and the
+        ?fields= sparse fieldset, e.g. ?fields=id,question to leave out answers.
+        Keys are versioned by the corpus generation, so any write to an FAQ
+        retires them without deleting anything. Rebuilds are single-flight:
+        concurrent misses are served the previous list meanwhile. The next and
+        previous links are relative and carry only lang, page_size and fields,
+        so a cached page is the same whichever request built it.
         
-        # If not in cache or cache failed, generate response
-        response = super().list(request, *args, **kwargs)
+        The rendered bytes are cached, so a hit skips the serializer and the
+        renderer, and a matching If-None-Match gets 304 without either.
+        """
+        language = request.query_params.get('lang', 'en')
+        languages = TranslationService.get_languages()
+        # Unknown languages and invalid cursors are errors here rather than cache entries
+        if language not in languages:
+            raise ValidationError({'lang': f"Expected one of: {', '.join(languages)}."})
+        cursor = request.query_params.get(self.paginator.cursor_query_param)
+        self.paginator.decode_cursor(request)
+        page_size = self.paginator.get_page_size(request)
+        fields = self._get_fields()
         
-        # Try to cache the response data
-        self._safe_cache_set(cache_key, response.data)
-        return response
+        # Only first pages keep a last known copy; a stale cursor page is rarely asked for
+        entry = cached_build(
+            page_cache_key(language, cursor, page_size, fields),
+            partial(build_page, language, cursor, page_size, fields),
+            keep_last=cursor is None
+        )
+        return cached_response(request, entry)
     
     @action(detail=False, methods=['get'])
     def by_language(self, request):
         """
         Get FAQs grouped by available languages with Redis caching
-        """
-        cache_key = self._get_cache_key_for_languages()
-        
-        # Try to get from cache
-        cached_data = self._safe_cache_get(cache_key)
-        if cached_data is not None:
-            return Response(cached_data)
         
-        # If not in cache or cache failed, generate response
-        languages = ['en', 'hi', 'bn']
-        result = {}
-        
-        for lang in languages:
-            list_cache_key = self._get_cache_key_for_list(lang)
-            lang_data = self._safe_cache_get(list_cache_key)
-            
-            if lang_data is None:
-                serializer = FAQSerializer(
-                    self.get_queryset(),
-                    many=True,
-                    context={'language': lang, 'request': request}
-                )
-                lang_data = serializer.data
-                self._safe_cache_set(list_cache_key, lang_data)
-            
-            result[lang] = lang_data
-        
-        # Try to cache the complete response
-        self._safe_cache_set(cache_key, result)
-        return Response(result)
+        The body is spliced together from the cached per-language lists
+        rather than stored again.
+        """
+        entries = {
+            lang: cached_build(
+                list_cache_key(lang), partial(build_language, lang)
+            )
+            for lang in TranslationService.get_languages()
+        }
+        return cached_response(request, join_languages(entries))
     
-    def perform_update(self, serializer):
-        """Clear relevant caches when an FAQ is updated"""
-        instance = serializer.instance
-        languages = ['en', 'hi', 'bn']
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Ranked full-text search of active FAQs in one language
         
-        # Clear individual FAQ caches
-        for lang in languages:
-            try:
-                cache.delete(self._get_cache_key_for_list(lang))
-            except (RedisError, ImproperlyConfigured):
-                pass
+        /faqs/search/?q=...&lang=hi matches the text as served in that
+        language; results come in numbered pages and accept ?fields=.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'A search query is required.'})
+        language = request.query_params.get('lang', 'en')
         
-        # Clear the by_language cache
-        try:
-            cache.delete(self._get_cache_key_for_languages())
-        except (RedisError, ImproperlyConfigured):
-            pass
+        paginator = FAQSearchPagination()
+        matches = FAQSearchDocument.objects.search(query, language).filter(
+            faq__is_active=True
+        ).values_list('faq_id', flat=True)
+        page = paginator.paginate_queryset(matches, request, view=self)
+        rows = {
+            row['id']: row
+            for row in FAQ.objects.filter(pk__in=page).for_language(language)
+        }
+        serializer = FAQListSerializer(
+            [rows[faq_id] for faq_id in page if faq_id in rows],
+            many=True,
+            fields=self._get_fields()
+        )
+        return paginator.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream every active FAQ in all languages as JSON lines
         
-        serializer.save()
+        One line per FAQ, with the question and answer of each language under
+        "languages". Rows are read FAQ_EXPORT_CHUNK_SIZE at a time and each
+        chunk is sent as soon as it is read, so memory does not grow with the
+        corpus. The stream is gzipped on the fly for clients that accept it.
+        """
+        chunk_size = getattr(settings, 'FAQ_EXPORT_CHUNK_SIZE', 500)
+        records = feed_records(
+            FAQ.objects.filter(is_active=True),
+            TranslationService.get_languages(),
+            chunk_size=chunk_size
+        )
+        use_gzip = bool(ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+        response = StreamingHttpResponse(
+            stream_lines(records, chunk_size, compress=use_gzip),
+            content_type='application/x-ndjson'
+        )
+        if use_gzip:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
     
-    def perform_destroy(self, instance):
-        """Clear relevant caches when an FAQ is deleted"""
-        languages = ['en', 'hi', 'bn']
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create or update many FAQs in one transaction
         
-        # Clear individual FAQ caches
-        for lang in languages:
-            try:
-                cache.delete(self._get_cache_key_for_list(lang))
-            except (RedisError, ImproperlyConfigured):
-                pass
+        Each item is matched to an FAQ by id, else by external_key, and is
+        created when neither matches. The cache is invalidated once and
+        translation of the changed fields is queued as one batch.
+        """
+        serializer = FAQBulkSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=getattr(settings, 'FAQ_BULK_MAX_SIZE', 10000)
+        )
+        serializer.is_valid(raise_exception=True)
+        records = [
+            {**item, 'translations': {t['lang']: t for t in item.get('translations', [])}}
+            for item in serializer.validated_data
+        ]
         
-        # Clear the by_language cache
         try:
-            cache.delete(self._get_cache_key_for_languages())
-        except (RedisError, ImproperlyConfigured):
-            pass
-        
-        instance.delete() 
\ No newline at end of file
+            with deferred_invalidation(), transaction.atomic():
+                importer = FAQImporter(chunk_size=len(records)).run(records)
+        except RecordError as e:
+            raise ValidationError(str(e))
+        except IntegrityError:
+            raise ValidationError('An external_key is already used by another FAQ.')
+        return Response({
+            'created': importer.created,
+            'updated': importer.updated,
+            'queued': importer.queued,
+        })
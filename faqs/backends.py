@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+import random
+import re
+import threading
+import time
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+class TranslationBackend:
+    """Interface implemented by every translation provider"""
+    name = None
+
+    def translate(self, text: str, target_lang: str, source_lang: str = 'en') -> str:
+        """Return the translation of text or raise on failure"""
+        raise NotImplementedError
+
+
+class GoogleTranslateBackend(TranslationBackend):
+    """Google Translate through googletrans, reusing one pooled HTTP client"""
+    name = 'google'
+
+    def __init__(self, timeout=10):
+        from googletrans import Translator
+
+        self.translator = Translator(timeout=timeout)
+
+    def translate(self, text, target_lang, source_lang='en'):
+        return self.translator.translate(text, dest=target_lang, src=source_lang).text
+
+
+class LocalBackend(TranslationBackend):
+    """
+    Deterministic offline stand-in for load tests and benchmarks
+
+    Every word is prefixed with the target language code, so the output is
+    predictable and keeps punctuation and markers untouched.
+    """
+    name = 'local'
+    WORD_PATTERN = re.compile(r'[^\W\d_]+')
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency  # seconds per call
+        self.failure_rate = failure_rate  # 0.0 - 1.0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def translate(self, text, target_lang, source_lang='en'):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            failed = self.failure_rate and self._random.random() < self.failure_rate
+        if failed:
+            raise ConnectionError('Injected local backend failure')
+        return self.WORD_PATTERN.sub(lambda match: f'{target_lang}:{match.group(0)}', text)
+
+
+def get_backend() -> TranslationBackend:
+    """Return the process-wide backend configured by TRANSLATION_BACKEND"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_class = import_string(getattr(
+                    settings, 'TRANSLATION_BACKEND', 'faqs.backends.GoogleTranslateBackend'
+                ))
+                options = dict(getattr(settings, 'TRANSLATION_BACKEND_OPTIONS', {}))
+                if backend_class is GoogleTranslateBackend:
+                    options.setdefault(
+                        'timeout', getattr(settings, 'TRANSLATION_CALL_TIMEOUT', 10)
+                    )
+                _backend = backend_class(**options)
+    return _backend
+
+
+@receiver(setting_changed)
+def reset_backend(setting, **kwargs):
+    """Build a new backend when its settings change (e.g. override_settings)"""
+    global _backend
+    backend_settings = (
+        'TRANSLATION_BACKEND', 'TRANSLATION_BACKEND_OPTIONS', 'TRANSLATION_CALL_TIMEOUT'
+    )
+    if setting in backend_settings:
+        _backend = None
@@ -0,0 +1,473 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+from redis.exceptions import RedisError
+from typing import Any, Callable, Dict, Iterable, Optional
+import logging
+import pickle
+import threading
+import time
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'faq:generation'
+CACHE_ERRORS = (RedisError, ImproperlyConfigured)
+
+# First byte of an encoded value: how the pickle after it is compressed
+RAW, ZLIB, ZSTD = b'p', b'z', b's'
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Pickle a value for the shared cache, compressing it past a size threshold
+
+    zstd is used when the zstandard package is installed, zlib otherwise.
+    Values that do not shrink, like pre-gzipped bodies, are stored as is.
+    """
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) < getattr(settings, 'FAQ_CACHE_COMPRESS_MIN_SIZE', 1024):
+        return RAW + data
+    if zstandard is not None:
+        packed = ZSTD + zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        packed = ZLIB + zlib.compress(data, 6)
+    return packed if len(packed) < len(data) else RAW + data
+
+
+def decode_value(encoded: bytes) -> Any:
+    """Inverse of encode_value; raises ValueError for values it cannot read"""
+    if not isinstance(encoded, bytes) or not encoded:
+        raise ValueError("Not an encoded FAQ cache value")
+    marker, data = encoded[:1], encoded[1:]
+    if marker == ZLIB:
+        data = zlib.decompress(data)
+    elif marker == ZSTD:
+        if zstandard is None:
+            raise ValueError("zstandard is not installed")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif marker != RAW:
+        raise ValueError(f"Unknown FAQ cache encoding {marker!r}")
+    return pickle.loads(data)
+
+
+def _decode_many(values: Dict[str, bytes]) -> Dict[str, Any]:
+    decoded = {}
+    for key, encoded in values.items():
+        try:
+            decoded[key] = decode_value(encoded)
+        except (ValueError, zlib.error, pickle.UnpicklingError) as e:
+            logger.warning(f"Dropping unreadable FAQ cache value {key}: {e}")
+    return decoded
+
+
+class LocalCache:
+    """
+    Size-bounded, thread-safe LRU of FAQ values kept in this process
+
+    Entries belong to one corpus generation; seeing a new generation drops
+    them all. Values are shared by reference, so callers must not mutate
+    what they get back.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.generation = None
+        self.checked_at = float('-inf')  # when the generation was last read
+
+    def _switch(self, generation):
+        if generation != self.generation:
+            self._entries.clear()
+            self.generation = generation
+
+    def observe(self, generation) -> None:
+        """Record the shared generation, dropping entries from older ones"""
+        with self._lock:
+            self._switch(generation)
+            self.checked_at = time.monotonic()
+
+    def recent_generation(self, max_age: float):
+        """The generation if it was read from the shared cache within max_age seconds"""
+        if time.monotonic() - self.checked_at < max_age:
+            return self.generation
+        return None
+
+    def get_many(self, keys: Iterable[str], generation) -> Dict[str, Any]:
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            self._switch(generation)
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                expires_at, value = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set_many(self, values: Dict[str, Any], generation) -> None:
+        expires_at = time.monotonic() + getattr(settings, 'FAQ_LOCAL_CACHE_TTL', 60)
+        max_entries = getattr(settings, 'FAQ_LOCAL_CACHE_SIZE', 512)
+        with self._lock:
+            self._switch(generation)
+            for key, value in values.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.checked_at = float('-inf')
+
+
+local_cache = LocalCache()
+
+
+def list_cache_key(language: str) -> str:
+    """Key of the full FAQ list in one language"""
+    return f'faq_list:{language}'
+
+
+def page_cache_key(language: str, cursor, page_size: int, fields=None) -> str:
+    """Key of one cursor page of the FAQ list"""
+    fieldset = ','.join(fields) if fields is not None else 'all'
+    return f'faq_page:{language}:{page_size}:{fieldset}:{cursor or "first"}'
+
+
+def _initial_generation() -> int:
+    # Start from the clock so a lost counter does not bring back an older generation
+    return int(time.time() * 1000)
+
+
+def get_generation() -> int:
+    """
+    Current generation of the FAQ corpus
+
+    Passed as the version of every cached FAQ value, so bumping it retires
+    all of them at once. Other workers' bumps are picked up within
+    FAQ_GENERATION_CHECK_INTERVAL seconds; while the shared cache is down the
+    last generation seen is kept.
+    """
+    interval = getattr(settings, 'FAQ_GENERATION_CHECK_INTERVAL', 1.0)
+    generation = local_cache.recent_generation(interval)
+    if generation is not None:
+        return generation
+
+    try:
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            cache.add(GENERATION_KEY, _initial_generation(), timeout=None)
+            generation = cache.get(GENERATION_KEY)
+    except CACHE_ERRORS:
+        if local_cache.generation is None:
+            raise
+        return local_cache.generation
+
+    local_cache.observe(generation)
+    return generation
+
+
+def bump_generation() -> None:
+    """Move cached FAQ values to a new generation with one atomic increment"""
+    try:
+        try:
+            generation = cache.incr(GENERATION_KEY)
+        except ValueError:
+            # The counter was evicted; a fresh one is newer than any earlier value
+            generation = _initial_generation()
+            if not cache.add(GENERATION_KEY, generation, timeout=None):
+                generation = cache.incr(GENERATION_KEY)
+    except CACHE_ERRORS as e:
+        logger.warning(f"Could not invalidate the shared FAQ cache: {e}")
+        local_cache.clear()
+        return
+    # Our own writes must never be served from this process, whatever the number
+    local_cache.clear()
+    local_cache.observe(generation)
+
+
+_deferred = threading.local()
+
+
+@contextmanager
+def deferred_invalidation(using=None):
+    """Collect the invalidations of many writes in this thread into one at the end"""
+    if getattr(_deferred, 'active', False):
+        yield
+        return
+    _deferred.active, _deferred.pending = True, False
+    try:
+        yield
+    finally:
+        pending = _deferred.pending
+        _deferred.active = _deferred.pending = False
+        if pending:
+            invalidate(using)
+
+
+def invalidate(using=None) -> None:
+    """
+    Invalidate cached FAQ values after a write
+
+    The generation is bumped right away and, inside a transaction, again on
+    commit, so a read made before the commit cannot keep stale values cached.
+    The cache is then warmed again if FAQ_CACHE_WARMER is set.
+    """
+    if getattr(_deferred, 'active', False):
+        _deferred.pending = True
+        return
+    bump_generation()
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(bump_generation, using=using)
+        transaction.on_commit(schedule_warm, using=using)
+    else:
+        schedule_warm()
+
+
+def _current_generation(generation=None):
+    try:
+        return generation or get_generation()
+    except CACHE_ERRORS as e:
+        logger.warning(f"FAQ cache unavailable: {e}")
+        return None
+
+
+def cache_get_many(keys: Iterable[str], generation=None) -> Dict[str, Any]:
+    """
+    Read FAQ values from this process first and the shared cache second
+
+    Never raises on cache errors; whatever could be read is returned.
+    """
+    keys = list(keys)
+    generation = _current_generation(generation)
+    if generation is None:
+        return {}
+
+    found = local_cache.get_many(keys, generation)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        try:
+            shared = _decode_many(cache.get_many(missing, version=generation))
+        except CACHE_ERRORS as e:
+            logger.warning(f"FAQ cache read failed: {e}")
+            return found
+        local_cache.set_many(shared, generation)
+        found.update(shared)
+    return found
+
+
+def cache_get(key: str, generation=None) -> Optional[Any]:
+    return cache_get_many([key], generation).get(key)
+
+
+def cache_set_many(values: Dict[str, Any], timeout=None, generation=None) -> None:
+    """Write FAQ values to both tiers under the current generation, encoded in Redis"""
+    generation = _current_generation(generation)
+    if generation is None:
+        return
+
+    local_cache.set_many(values, generation)
+    try:
+        cache.set_many(
+            {key: encode_value(value) for key, value in values.items()},
+            timeout=timeout or getattr(settings, 'CACHE_TTL', 60 * 15),
+            version=generation
+        )
+    except CACHE_ERRORS as e:
+        logger.warning(f"FAQ cache write failed: {e}")
+
+
+def cache_set(key: str, value: Any, timeout=None, generation=None) -> None:
+    cache_set_many({key: value}, timeout, generation)
+
+
+def memoize_locally(key: str, build: Callable[[], Any]) -> Any:
+    """Keep a value derived from other cached values in this process only"""
+    generation = _current_generation()
+    if generation is None:
+        return build()
+    value = local_cache.get_many([key], generation).get(key)
+    if value is None:
+        value = build()
+        local_cache.set_many({key: value}, generation)
+    return value
+
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='faq-cache-refresh')
+_warm_scheduled = threading.Event()
+
+
+def schedule_warm() -> None:
+    """
+    Run the FAQ_CACHE_WARMER callable in the background, if one is set
+
+    Writes arriving while a warm is queued share it, and only one worker
+    warms each generation.
+    """
+    warmer_path = getattr(settings, 'FAQ_CACHE_WARMER', None)
+    if not warmer_path or _warm_scheduled.is_set():
+        return
+    _warm_scheduled.set()
+
+    def warm():
+        _warm_scheduled.clear()
+        generation = _current_generation()
+        lock_key = f'lock:warm:{generation}'
+        if generation is None or not _acquire(lock_key):
+            return
+        try:
+            import_string(warmer_path)()
+        except Exception:
+            logger.exception("Warming the FAQ cache failed")
+        finally:
+            connections.close_all()
+
+    _refresh_executor.submit(warm)
+
+
+def _acquire(lock_key: str) -> bool:
+    """Take a short cross-worker lock; without a shared cache everyone may build"""
+    try:
+        return cache.add(lock_key, 1, timeout=getattr(settings, 'FAQ_CACHE_LOCK_TIMEOUT', 10))
+    except CACHE_ERRORS:
+        return True
+
+
+def _release(lock_key: str) -> None:
+    try:
+        cache.delete(lock_key)
+    except CACHE_ERRORS:
+        pass
+
+
+def store_built(
+    values: Dict[str, Any], timeout=None, generation=None, keep_last: bool = True
+) -> None:
+    """
+    Store values read through cached_build, fresh for this generation and,
+    with keep_last, as the last known copies, with one bulk write per tier
+    """
+    soft_expires_at = time.time() + getattr(settings, 'FAQ_CACHE_SOFT_TTL', 60)
+    entries = {
+        key: {'value': value, 'soft_expires_at': soft_expires_at}
+        for key, value in values.items()
+    }
+    cache_set_many(entries, timeout, generation)
+    if not keep_last:
+        return
+    try:
+        cache.set_many(
+            {f'{key}:last': encode_value(entry) for key, entry in entries.items()},
+            timeout=getattr(settings, 'FAQ_CACHE_STALE_TTL', 60 * 60 * 24)
+        )
+    except CACHE_ERRORS:
+        pass
+
+
+def _get_last(key: str) -> Optional[dict]:
+    """The last entry built for key, whatever its generation"""
+    try:
+        encoded = cache.get(f'{key}:last')
+    except CACHE_ERRORS:
+        return None
+    if encoded is None:
+        return None
+    return _decode_many({key: encoded}).get(key)
+
+
+def _rebuild(
+    key: str, build: Callable[[], Any], generation, timeout=None, keep_last: bool = True
+) -> Any:
+    value = build()
+    store_built({key: value}, timeout, generation, keep_last)
+    return value
+
+
+def _refresh_in_background(
+    key: str, build: Callable[[], Any], generation, timeout=None, keep_last: bool = True
+) -> None:
+    lock_key = f'lock:{key}:{generation}'
+    if not _acquire(lock_key):
+        return
+
+    def refresh():
+        try:
+            _rebuild(key, build, generation, timeout, keep_last)
+        except Exception:
+            logger.exception(f"Background refresh of {key} failed")
+        finally:
+            _release(lock_key)
+            connections.close_all()
+
+    _refresh_executor.submit(refresh)
+
+
+def _wait_for(key: str, generation) -> Optional[Any]:
+    """Poll briefly for a value another worker is building"""
+    deadline = time.monotonic() + getattr(settings, 'FAQ_CACHE_LOCK_WAIT', 2.0)
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = cache_get(key, generation)
+        if entry is not None:
+            return entry['value']
+    return None
+
+
+def cached_build(
+    key: str, build: Callable[[], Any], timeout=None, keep_last: bool = True
+) -> Any:
+    """
+    Return the cached value for key, building it at most once at a time
+
+    - A fresh entry is returned as is.
+    - Past its soft expiry (FAQ_CACHE_SOFT_TTL) it is still returned while
+      one worker rebuilds it in the background.
+    - On a miss, e.g. after invalidation, the worker holding a short lock
+      rebuilds it. Everyone else is served the last known value, or polls
+      for up to FAQ_CACHE_LOCK_WAIT seconds when there is none, and builds
+      it themselves as a last resort.
+    
+    build may run on another thread after the caller has returned, so it
+    must capture plain values only, never a request or a view. Without
+    keep_last no last known copy is stored, and a miss waits or builds.
+    """
+    generation = _current_generation()
+    if generation is None:
+        return build()
+
+    entry = cache_get(key, generation)
+    if entry is not None:
+        if entry['soft_expires_at'] <= time.time():
+            _refresh_in_background(key, build, generation, timeout, keep_last)
+        return entry['value']
+
+    lock_key = f'lock:{key}:{generation}'
+    if _acquire(lock_key):
+        try:
+            return _rebuild(key, build, generation, timeout, keep_last)
+        finally:
+            _release(lock_key)
+
+    last = _get_last(key) if keep_last else None
+    if last is not None:
+        return last['value']
+
+    value = _wait_for(key, generation)
+    return build() if value is None else value
@@ -0,0 +1,48 @@
+from contextlib import nullcontext
+from django.core.management.base import BaseCommand, CommandError
+from faqs.models import FAQ
+from faqs.transfer import FORMATS, export_records, guess_format, write_records
+import sys
+
+
+class Command(BaseCommand):
+    help = "Write FAQs and their translations to a JSON Lines or CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-o', '--output', default='-',
+            help='File to write, or - for standard output'
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Output format (default: from the file extension, else jsonl)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of FAQs read from the database at a time'
+        )
+        parser.add_argument(
+            '--active-only', action='store_true',
+            help='Skip inactive FAQs'
+        )
+
+    def handle(self, *args, **options):
+        path = options['output']
+        fmt = options['format'] or guess_format(path)
+        queryset = FAQ.objects.all()
+        if options['active_only']:
+            queryset = queryset.filter(is_active=True)
+
+        stream = nullcontext(sys.stdout) if path == '-' else open(
+            path, 'w', encoding='utf-8', newline=''
+        )
+        try:
+            with stream as target:
+                count = write_records(
+                    target, export_records(queryset, options['chunk_size']), fmt
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        if path != '-':
+            self.stdout.write(self.style.SUCCESS(f"Exported {count} FAQs to {path}"))
@@ -0,0 +1,65 @@
+from contextlib import nullcontext
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from faqs.tasks import TranslationWorker
+from faqs.transfer import FORMATS, FAQImporter, RecordError, guess_format, read_records
+import sys
+
+
+class Command(BaseCommand):
+    help = "Create or update FAQs from a JSON Lines or CSV file"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='File to read, or - for standard input'
+        )
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Input format (default: from the file extension, else jsonl)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of records written per transaction'
+        )
+        parser.add_argument(
+            '--no-translate', action='store_true',
+            help='Do not queue translation jobs for the imported content'
+        )
+        parser.add_argument(
+            '--translate-now', action='store_true',
+            help='Process the queued translation jobs before exiting'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Number of FAQs translated in parallel with --translate-now'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or guess_format(path)
+        importer = FAQImporter(
+            chunk_size=options['chunk_size'],
+            queue_translations=not options['no_translate'],
+        )
+
+        stream = nullcontext(sys.stdin) if path == '-' else open(
+            path, encoding='utf-8', newline=''
+        )
+        try:
+            with stream as source:
+                importer.run(read_records(source, fmt))
+        except (OSError, IntegrityError, RecordError) as e:
+            raise CommandError(
+                f"{e} ({importer.created} created and {importer.updated} updated before the error)"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {importer.created + importer.updated} FAQs "
+            f"({importer.created} created, {importer.updated} updated), "
+            f"queued {importer.queued} translation jobs"
+        ))
+
+        if options['translate_now'] and importer.queued:
+            TranslationWorker(concurrency=options['concurrency']).run(exit_when_empty=True)
+            self.stdout.write(self.style.SUCCESS("Translation jobs processed"))
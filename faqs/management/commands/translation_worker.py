@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from faqs.tasks import TranslationWorker
+
+
+class Command(BaseCommand):
+    help = "Process pending FAQ translation jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Number of FAQs translated in parallel'
+        )
+        parser.add_argument(
+            '--max-retries', type=int, default=5,
+            help='Attempts before a job is marked as failed'
+        )
+        parser.add_argument(
+            '--backoff', type=float, default=2.0,
+            help='Base retry delay in seconds, doubled on every attempt'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=50,
+            help='Number of jobs claimed at a time'
+        )
+        parser.add_argument(
+            '--lease-timeout', type=float, default=300,
+            help='Seconds after which a running job left by a dead worker is claimed again'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Seconds to wait when the queue is empty'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the queue is empty instead of polling'
+        )
+
+    def handle(self, *args, **options):
+        worker = TranslationWorker(
+            concurrency=options['concurrency'],
+            max_retries=options['max_retries'],
+            backoff=options['backoff'],
+            batch_size=options['batch_size'],
+            lease_timeout=options['lease_timeout'],
+        )
+        self.stdout.write("Translation worker started")
+        try:
+            worker.run(
+                poll_interval=options['poll_interval'],
+                exit_when_empty=options['once'],
+            )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Translation worker stopped"))
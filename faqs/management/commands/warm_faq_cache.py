@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from faqs.warming import warm_cache
+
+
+class Command(BaseCommand):
+    help = "Precompute the cached FAQ lists and translated fields for every language"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--language', action='append', dest='languages',
+            help='Language to warm; may be repeated (default: every supported language)'
+        )
+
+    def handle(self, *args, **options):
+        timings = warm_cache(options['languages'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {timings['entries']} entries in "
+            f"{timings['read'] + timings['render'] + timings['write']:.2f}s "
+            f"(read {timings['read']:.2f}s, render {timings['render']:.2f}s, "
+            f"write {timings['write']:.2f}s)"
+        ))
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faqs', '0004_translationmemory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=20)),
+                ('language', models.CharField(max_length=10)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('faq', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='translation_jobs', to='faqs.faq')),
+            ],
+            options={
+                'verbose_name': 'Translation Job',
+                'verbose_name_plural': 'Translation Jobs',
+                'ordering': ['available_at'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='translation_job_queue_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='translationjob',
+            constraint=models.UniqueConstraint(fields=('faq', 'field', 'language'), name='unique_translation_job'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faqs', '0005_translationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='faq',
+            name='translation_segments',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Per-segment source hashes and translations, by field and language'),
+        ),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_quill.fields
+
+TARGET_LANGUAGES = ['hi', 'bn']
+
+
+def copy_translations(apps, schema_editor):
+    """Move the per-language columns of FAQ into FAQTranslation rows"""
+    FAQ = apps.get_model('faqs', 'FAQ')
+    FAQTranslation = apps.get_model('faqs', 'FAQTranslation')
+
+    batch = []
+    rows = FAQ.objects.values(
+        'id', 'last_translated', 'translation_segments',
+        'question_hi', 'answer_hi', 'question_bn', 'answer_bn'
+    )
+    for row in rows.iterator(chunk_size=500):
+        segments = row['translation_segments'] or {}
+        for lang in TARGET_LANGUAGES:
+            question = row[f'question_{lang}']
+            answer = row[f'answer_{lang}']
+            if not question and not answer:
+                continue
+            batch.append(FAQTranslation(
+                faq_id=row['id'],
+                lang=lang,
+                question=question,
+                answer=answer,
+                segments={
+                    field: by_lang[lang]
+                    for field, by_lang in segments.items()
+                    if lang in by_lang
+                },
+                translated_at=row['last_translated'],
+            ))
+        if len(batch) >= 500:
+            FAQTranslation.objects.bulk_create(batch)
+            batch = []
+    FAQTranslation.objects.bulk_create(batch)
+
+
+def restore_columns(apps, schema_editor):
+    """Copy FAQTranslation rows back into the per-language columns of FAQ"""
+    FAQ = apps.get_model('faqs', 'FAQ')
+    FAQTranslation = apps.get_model('faqs', 'FAQTranslation')
+
+    for translation in FAQTranslation.objects.filter(lang__in=TARGET_LANGUAGES).iterator():
+        faq = FAQ.objects.get(pk=translation.faq_id)
+        setattr(faq, f'question_{translation.lang}', translation.question)
+        setattr(faq, f'answer_{translation.lang}', translation.answer)
+        segments = faq.translation_segments or {}
+        for field, pairs in (translation.segments or {}).items():
+            segments.setdefault(field, {})[translation.lang] = pairs
+        faq.translation_segments = segments
+        faq.save(update_fields=[
+            f'question_{translation.lang}', f'answer_{translation.lang}', 'translation_segments'
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faqs', '0006_faq_translation_segments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FAQTranslation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lang', models.CharField(max_length=10, verbose_name='Language')),
+                ('question', models.TextField(blank=True, null=True)),
+                ('answer', django_quill.fields.QuillField(blank=True, null=True)),
+                ('source_hash', models.CharField(blank=True, editable=False, help_text='Digest of the English content this translation was made from', max_length=32)),
+                ('segments', models.JSONField(blank=True, default=dict, editable=False, help_text='Per-segment source hashes and translations, by field')),
+                ('translated_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('faq', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='translations', to='faqs.faq')),
+            ],
+            options={
+                'verbose_name': 'FAQ Translation',
+                'verbose_name_plural': 'FAQ Translations',
+                'ordering': ['lang'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='faqtranslation',
+            constraint=models.UniqueConstraint(fields=('lang', 'faq'), name='unique_faq_translation'),
+        ),
+        migrations.RunPython(copy_translations, restore_columns),
+        migrations.RemoveField(
+            model_name='faq',
+            name='answer_bn',
+        ),
+        migrations.RemoveField(
+            model_name='faq',
+            name='answer_hi',
+        ),
+        migrations.RemoveField(
+            model_name='faq',
+            name='question_bn',
+        ),
+        migrations.RemoveField(
+            model_name='faq',
+            name='question_hi',
+        ),
+        migrations.RemoveField(
+            model_name='faq',
+            name='translation_segments',
+        ),
+    ]
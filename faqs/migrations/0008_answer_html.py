@@ -0,0 +1,146 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:38
+
+from django.db import migrations, models
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+import json
+import re
+
+# A frozen copy of faqs.richtext.sanitize_html as of this migration, so later
+# changes to the sanitizer do not change what this backfill writes.
+
+# Markup the Quill editor produces; anything else is dropped when rendering
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'h1', 'h2', 'h3', 'h4',
+    'h5', 'h6', 'i', 'img', 'li', 'ol', 'p', 'pre', 's', 'span', 'strike',
+    'strong', 'sub', 'sup', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    '*': {'class'},
+    'a': {'href', 'rel', 'target'},
+    'img': {'alt', 'src'},
+}
+VOID_TAGS = {'br', 'img'}
+# Elements removed together with their content
+DROPPED_TAGS = {'embed', 'iframe', 'noscript', 'object', 'script', 'style', 'template'}
+SAFE_URL_SCHEMES = {'', 'http', 'https', 'mailto', 'tel'}
+
+
+def _is_safe_url(name: str, value: str) -> bool:
+    # Browsers ignore whitespace and control characters inside a scheme
+    url = re.sub(r'[\x00-\x20]+', '', value).lower()
+    if name == 'src' and url.startswith('data:image/'):
+        return True
+    return urlsplit(url).scheme in SAFE_URL_SCHEMES
+
+
+class _Sanitizer(HTMLParser):
+    """Rebuilds HTML keeping only allowed tags, attributes and URLs"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.open_tags = []
+        self._dropped_depth = 0
+
+    def _attributes(self, tag, attrs):
+        allowed = ALLOWED_ATTRIBUTES['*'] | ALLOWED_ATTRIBUTES.get(tag, set())
+        return ''.join(
+            f' {name}="{escape(value)}"'
+            for name, value in attrs
+            if name in allowed and value is not None
+            and (name not in ('href', 'src') or _is_safe_url(name, value))
+        )
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            self._dropped_depth += 1
+        elif not self._dropped_depth and tag in ALLOWED_TAGS:
+            self.output.append(f'<{tag}{self._attributes(tag, attrs)}>')
+            if tag not in VOID_TAGS:
+                self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self._dropped_depth = max(self._dropped_depth - 1, 0)
+        elif not self._dropped_depth and tag in self.open_tags:
+            # Close anything left open inside this element as well
+            while self.open_tags:
+                open_tag = self.open_tags.pop()
+                self.output.append(f'</{open_tag}>')
+                if open_tag == tag:
+                    break
+
+    def handle_data(self, data):
+        if not self._dropped_depth:
+            self.output.append(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        self.output.extend(f'</{tag}>' for tag in reversed(self.open_tags))
+        self.open_tags = []
+
+
+def sanitize_html(html: str) -> str:
+    """
+    Make editor HTML safe to serve as-is
+
+    Tags and attributes outside the Quill allow-list are removed, along with
+    scripts, styles, comments and unsafe URLs such as javascript:. Text is
+    re-escaped and unclosed elements are closed.
+    """
+    if not html:
+        return ''
+    sanitizer = _Sanitizer()
+    sanitizer.feed(html)
+    sanitizer.close()
+    return ''.join(sanitizer.output)
+
+
+
+def _render(value):
+    try:
+        html = json.loads(value).get('html', '') if value else ''
+    except (ValueError, AttributeError):
+        html = value
+    return sanitize_html(html)
+
+
+def render_answers(apps, schema_editor):
+    """Fill answer_html for existing FAQs and translations"""
+    for model_name in ('FAQ', 'FAQTranslation'):
+        model = apps.get_model('faqs', model_name)
+        batch = []
+        for pk, answer in model.objects.values_list('pk', 'answer').iterator(chunk_size=500):
+            batch.append(model(pk=pk, answer_html=_render(answer)))
+            if len(batch) >= 500:
+                model.objects.bulk_update(batch, ['answer_html'])
+                batch = []
+        model.objects.bulk_update(batch, ['answer_html'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faqs', '0007_faqtranslation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='faq',
+            name='answer_html',
+            field=models.TextField(blank=True, editable=False, help_text='Sanitized HTML of the answer, rendered when it is saved'),
+        ),
+        migrations.AddField(
+            model_name='faqtranslation',
+            name='answer_html',
+            field=models.TextField(blank=True, editable=False, help_text='Sanitized HTML of the answer, rendered when it is saved'),
+        ),
+        migrations.RunPython(render_answers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,165 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:01
+
+from django.db import migrations, models
+from html.parser import HTMLParser
+import django.db.models.deletion
+import unicodedata
+
+# Languages served when this migration was written; any other language with
+# translations is indexed too
+LANGUAGES = ['en', 'hi', 'bn']
+FTS_TABLE = 'faqs_faqsearch_fts'
+TABLE = 'faqs_faqsearchdocument'
+# unicode61 splits words at combining marks, such as Indic vowel signs
+INDIC_MARKS = ''.join(
+    char for char in map(chr, range(0x0900, 0x0E00))
+    if unicodedata.category(char).startswith('M')
+)
+
+SQLITE_INDEX = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        content, content='{TABLE}', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2 tokenchars '{INDIC_MARKS}'"
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+
+def create_search_index(apps, schema_editor):
+    """Full-text index over the documents, kept up to date by the database"""
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_INDEX:
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for trigger in ('insert', 'delete', 'update'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+# A frozen copy of faqs.richtext.search_text as of this migration
+class _TextRunParser(HTMLParser):
+    """Splits HTML into raw markup and the text runs between tags"""
+
+    RAW_TEXT_TAGS = {'script', 'style'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []  # (is_text, value) pairs
+        self._raw_depth = 0
+
+    def _markup(self, value):
+        self.parts.append((False, value))
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.RAW_TEXT_TAGS:
+            self._raw_depth += 1
+        self._markup(self.get_starttag_text())
+
+    def handle_startendtag(self, tag, attrs):
+        self._markup(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if tag in self.RAW_TEXT_TAGS and self._raw_depth:
+            self._raw_depth -= 1
+        self._markup(f'</{tag}>')
+
+    def handle_comment(self, data):
+        self._markup(f'<!--{data}-->')
+
+    def handle_decl(self, decl):
+        self._markup(f'<!{decl}>')
+
+    def handle_data(self, data):
+        if self._raw_depth:
+            self._markup(data)
+        elif self.parts and self.parts[-1][0]:
+            self.parts[-1] = (True, self.parts[-1][1] + data)
+        else:
+            self.parts.append((True, data))
+
+
+def search_text(question, answer_html):
+    parser = _TextRunParser()
+    parser.feed(answer_html or '')
+    parser.close()
+    runs = [value.strip() for is_text, value in parser.parts if is_text and value.strip()]
+    return '\n'.join(filter(None, [question, ' '.join(runs)]))
+
+
+def index_faqs(apps, schema_editor):
+    """Write the documents of existing FAQs, falling back to English per field"""
+    FAQ = apps.get_model('faqs', 'FAQ')
+    FAQTranslation = apps.get_model('faqs', 'FAQTranslation')
+    FAQSearchDocument = apps.get_model('faqs', 'FAQSearchDocument')
+    languages = LANGUAGES + sorted(
+        set(FAQTranslation.objects.order_by().values_list('lang', flat=True).distinct()) - set(LANGUAGES)
+    )
+
+    rows = FAQ.objects.values_list('id', 'question', 'answer_html').iterator(chunk_size=500)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= 500:
+            _index_chunk(FAQTranslation, FAQSearchDocument, chunk, languages)
+            chunk = []
+    _index_chunk(FAQTranslation, FAQSearchDocument, chunk, languages)
+
+
+def _index_chunk(FAQTranslation, FAQSearchDocument, chunk, languages):
+    translations = {
+        (faq_id, lang): (question, answer_html)
+        for faq_id, lang, question, answer_html in FAQTranslation.objects.filter(
+            faq_id__in=[faq_id for faq_id, _, _ in chunk]
+        ).values_list('faq_id', 'lang', 'question', 'answer_html')
+    }
+    documents = []
+    for faq_id, question, answer_html in chunk:
+        for lang in languages:
+            translated_question, translated_answer = translations.get((faq_id, lang), (None, None))
+            documents.append(FAQSearchDocument(
+                faq_id=faq_id,
+                lang=lang,
+                content=search_text(translated_question or question, translated_answer or answer_html),
+            ))
+    FAQSearchDocument.objects.bulk_create(documents)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faqs', '0009_faq_active_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FAQSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lang', models.CharField(max_length=10)),
+                ('content', models.TextField()),
+                ('faq', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to='faqs.faq')),
+            ],
+            options={
+                'verbose_name': 'FAQ Search Document',
+                'verbose_name_plural': 'FAQ Search Documents',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='faqsearchdocument',
+            constraint=models.UniqueConstraint(fields=('faq', 'lang'), name='unique_faq_search_document'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(index_faqs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faqs', '0010_faqsearchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='faq',
+            name='external_key',
+            field=models.CharField(blank=True, help_text='Identifier of this FAQ in an external system, used to sync it', max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+
+# Text search configuration per language as of this migration; others use 'simple'.
+# SearchDocumentQuerySet.search() builds the same to_tsvector() expressions.
+SEARCH_CONFIGS = {'en': 'english'}
+DEFAULT_CONFIG = 'simple'
+
+
+def search_indexes():
+    """One partial GIN index over to_tsvector(content) per text search configuration"""
+    # django.contrib.postgres needs the PostgreSQL driver, so it is only imported here
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    indexes = [
+        GinIndex(
+            SearchVector('content', config=config),
+            condition=models.Q(lang=lang),
+            name=f'faqs_search_{config}_gin',
+        )
+        for lang, config in SEARCH_CONFIGS.items()
+    ]
+    indexes.append(GinIndex(
+        SearchVector('content', config=DEFAULT_CONFIG),
+        condition=~models.Q(lang__in=list(SEARCH_CONFIGS)),
+        name=f'faqs_search_{DEFAULT_CONFIG}_gin',
+    ))
+    return indexes
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    FAQSearchDocument = apps.get_model('faqs', 'FAQSearchDocument')
+    for index in search_indexes():
+        schema_editor.add_index(FAQSearchDocument, index)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    FAQSearchDocument = apps.get_model('faqs', 'FAQSearchDocument')
+    for index in search_indexes():
+        schema_editor.remove_index(FAQSearchDocument, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('faqs', '0011_faq_external_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
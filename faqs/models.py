@@ -1,21 +1,116 @@
-from django.db import models
-from django.core.cache import cache
+from collections import ChainMap
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, NullIf
 from django.conf import settings
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django_quill.fields import QuillField
+from django.utils.html import strip_tags
+from .richtext import (
+    delta_text_runs, html_text_runs, sanitize_html, search_text, segment_hash, split_blocks,
+    translate_delta, translate_html_runs, translate_plain
+)
+from .caching import cache_get, cache_get_many, cache_set, cache_set_many, invalidate
 from .services import TranslationService
 import json
 
+def get_quill_html(value):
+    """Extract HTML content from a Quill field or JSON string"""
+    if hasattr(value, 'json_string'):
+        value = value.json_string
+    if isinstance(value, str):
+        try:
+            data = json.loads(value)
+            return data.get('html', '')
+        except (json.JSONDecodeError, AttributeError):
+            return value
+    return str(value) if value else ''
+
+
+class CorpusQuerySet(models.QuerySet):
+    """Bulk writes send no signals, so they invalidate the FAQ cache themselves"""
+    
+    def update(self, **kwargs):
+        # bulk_update() goes through here as well
+        rows = super().update(**kwargs)
+        if rows:
+            invalidate(self.db)
+        return rows
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            invalidate(self.db)
+        return created
+
+
+class FAQQuerySet(CorpusQuerySet):
+    # Fields whose text is in the search index
+    SEARCHED_FIELDS = {'question', 'answer', 'answer_html'}
+    
+    def update(self, **kwargs):
+        if not self.SEARCHED_FIELDS.intersection(kwargs):
+            return super().update(**kwargs)
+        faq_ids = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        FAQSearchDocument.reindex(faq_ids)
+        return rows
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        FAQSearchDocument.reindex(faq.pk for faq in created if faq.pk)
+        return created
+    
+    def for_language(self, language_code):
+        """
+        Flat rows with the question and answer HTML in one language.
+        
+        The translation row is joined and the fallback to English is done in
+        the database, so a whole list is read with one query. Answers come
+        from the pre-rendered answer_html columns, never the Quill JSON. Each row has
+        id, translated_question, translated_answer, created_at, updated_at and
+        is_active.
+        """
+        queryset = self
+        question = models.F('question')
+        answer = models.F('answer_html')
+        if language_code != 'en':
+            queryset = queryset.alias(translation=models.FilteredRelation(
+                'translations', condition=models.Q(translations__lang=language_code)
+            ))
+            empty = models.Value('', output_field=models.TextField())
+            question = Coalesce(NullIf('translation__question', empty), question)
+            answer = Coalesce(NullIf('translation__answer_html', empty), answer)
+        
+        return queryset.annotate(
+            translated_question=question,
+            translated_answer=answer
+        ).values(
+            'id', 'translated_question', 'translated_answer',
+            'created_at', 'updated_at', 'is_active'
+        )
+    
+    def with_language(self, language_code):
+        """Load the translation rows for one language only, in a single extra query"""
+        if language_code == 'en':
+            return self
+        return self.prefetch_related(models.Prefetch(
+            'translations',
+            queryset=FAQTranslation.objects.filter(lang=language_code),
+            to_attr=f'_prefetched_translations_{language_code}'
+        ))
+
+
 class FAQ(models.Model):
     question = models.TextField(verbose_name="Question (English)")
     answer = QuillField(verbose_name="Answer (English)")
-    
-    question_hi = models.TextField(verbose_name="Question (Hindi)", blank=True, null=True)
-    answer_hi = QuillField(verbose_name="Answer (Hindi)", blank=True, null=True)
-    question_bn = models.TextField(verbose_name="Question (Bengali)", blank=True, null=True)
-    answer_bn = QuillField(verbose_name="Answer (Bengali)", blank=True, null=True)
+    answer_html = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="Sanitized HTML of the answer, rendered when it is saved"
+    )
     
     auto_translate = models.BooleanField(
         default=True,
@@ -29,14 +124,37 @@ class FAQ(models.Model):
         help_text="Last time translations were updated"
     )
     
+    external_key = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Identifier of this FAQ in an external system, used to sync it"
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
+    objects = FAQQuerySet.as_manager()
+    
+    # English fields that are translated into the other languages
+    SOURCE_FIELDS = ('question', 'answer')
+    # Columns rendered from a source field when it is saved
+    RENDERED_FIELDS = {'answer_html': 'answer'}
+    
     class Meta:
         verbose_name = "FAQ"
         verbose_name_plural = "FAQs"
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination walks active FAQs newest first
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='faq_active_created_idx',
+                condition=models.Q(is_active=True)
+            )
+        ]
     
     def __str__(self):
         return self.question[:100]
@@ -44,136 +162,603 @@ class FAQ(models.Model):
     def _get_cache_key(self, field_name, language_code):
         return f'faq:{self.id}:{field_name}:{language_code}'
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the English source as loaded so save() can tell what changed
+        # without reading the row again
+        instance._loaded_source = {
+            name: value for name, value in zip(field_names, values)
+            if name in cls.SOURCE_FIELDS
+        }
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        if fields is None:
+            self.__dict__.pop('_translation_cache', None)
+        self.__dict__.pop('_translated_text', None)
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        
+        deferred = self.get_deferred_fields()
+        self._remember_source([
+            field for field in self.SOURCE_FIELDS
+            if field not in deferred and (fields is None or field in fields)
+        ])
+    
+    def _remember_source(self, fields):
+        """Record the current English text of fields as the stored version"""
+        loaded = self.__dict__.setdefault('_loaded_source', {})
+        for field in fields:
+            loaded[field] = self._get_source_text(field)
+    
+    def get_changed_source_fields(self):
+        """
+        English fields whose text differs from the version in the database.
+        
+        Compares against the values captured when the instance was loaded, so
+        no query is made. Every field counts as changed on a new instance.
+        """
+        loaded = self.__dict__.get('_loaded_source')
+        if self._state.adding or loaded is None:
+            return list(self.SOURCE_FIELDS)
+        
+        deferred = self.get_deferred_fields()
+        return [
+            field for field in self.SOURCE_FIELDS
+            if field not in deferred
+            and self._get_source_text(field) != self._source_text(field, loaded.get(field))
+        ]
+    
+    def get_translation(self, language_code):
+        """Return the FAQTranslation for a language, or None, loading it once per instance"""
+        translations = self.__dict__.setdefault('_translation_cache', {})
+        if language_code not in translations:
+            prefetched = getattr(self, f'_prefetched_translations_{language_code}', None)
+            if prefetched is not None:
+                translations[language_code] = prefetched[0] if prefetched else None
+            elif self.pk:
+                translations[language_code] = self.translations.filter(
+                    lang=language_code
+                ).first()
+            else:
+                translations[language_code] = None
+        return translations[language_code]
+    
+    def _get_or_build_translation(self, language_code):
+        translation = self.get_translation(language_code)
+        if translation is None:
+            translation = FAQTranslation(faq=self, lang=language_code)
+            self._translation_cache[language_code] = translation
+        return translation
+    
+    def save_translations(self):
+        """Write translations changed on this instance; returns how many were written"""
+        return FAQ.save_translations_bulk([self])
+    
+    @classmethod
+    def save_translations_bulk(cls, faqs):
+        """Write translations changed on several instances with one query"""
+        return FAQTranslation.upsert(
+            translation
+            for faq in faqs
+            for translation in faq.__dict__.get('_translation_cache', {}).values()
+            if translation is not None and translation.is_dirty
+        )
+    
     def _get_quill_html(self, value):
         """Extract HTML content from a Quill field or JSON string"""
-        if hasattr(value, 'html'):
-            return value.html
-        if isinstance(value, str):
-            try:
-                data = json.loads(value)
-                return data.get('html', '')
-            except json.JSONDecodeError:
-                return value
+        return get_quill_html(value)
+    
+    def _get_quill_delta(self, value):
+        """Extract the delta dict from a Quill field or JSON string, if any"""
+        try:
+            delta = value.delta if hasattr(value, 'delta') else json.loads(value)['delta']
+            if isinstance(delta, str):
+                delta = json.loads(delta)
+        except (ValueError, KeyError, TypeError):
+            return None
+        return delta if isinstance(delta, dict) and 'ops' in delta else None
+    
+    def _source_text(self, field_name, value):
+        """Text sent for translation for a raw or loaded field value"""
+        if not value:
+            return None
+        if field_name == 'answer':
+            return self._get_quill_html(value)
         return str(value)
     
+    def _get_source_text(self, field_name):
+        """Return the English text sent for translation for a field"""
+        return self._source_text(field_name, getattr(self, field_name))
+    
+    def _get_known_segments(self, field_name, languages):
+        """Map source segment hashes to their stored translations per language"""
+        known = {}
+        for lang in languages:
+            translation = self.get_translation(lang)
+            if translation is None:
+                continue
+            for source_hash, translated_text in (translation.segments or {}).get(field_name, []):
+                known.setdefault(source_hash, {})[lang] = translated_text
+        return known
+    
+    def get_source_hash(self):
+        """Digest of the English content, stored with translations made from it"""
+        return segment_hash(
+            f"{self._get_source_text('question') or ''}\x00{self._get_source_text('answer') or ''}"
+        )
+    
+    def _apply_translation(self, field_name, target_lang, segments, delta=None):
+        """Store translated (source hash, text) segments on the language's translation"""
+        translated_text = ''.join(text for _, text in segments)
+        if not translated_text:
+            return False
+        
+        translation = self._get_or_build_translation(target_lang)
+        if field_name == 'answer':
+            if delta is None:
+                delta = {"ops": [{"insert": f"{strip_tags(translated_text)}\n"}]}
+            # The Quill widget stores the delta as a JSON string inside the JSON value
+            translated_data = {
+                "delta": json.dumps(delta, ensure_ascii=False),
+                "html": translated_text
+            }
+            translation.answer = json.dumps(translated_data, ensure_ascii=False)
+        else:
+            translation.question = translated_text
+        
+        translation.segments = dict(translation.segments or {})
+        translation.segments[field_name] = [[source_hash, text] for source_hash, text in segments]
+        translation.source_hash = self.get_source_hash()
+        translation.translated_at = timezone.now()
+        translation.is_dirty = True
+        self.last_translated = translation.translated_at
+        return True
+    
     def translate_field(self, field_name: str, target_lang: str) -> bool:
         """Translate a specific field to the target language"""
-        if not self.auto_translate or target_lang == 'en':
+        if target_lang == 'en':
             return False
-            
-        source_value = getattr(self, field_name)
-        if not source_value:
+        return self.update_translations([field_name], [target_lang])
+    
+    def update_translations(self, fields=None, languages=None):
+        """Update translations for all or specific fields with one batched call"""
+        if not self.auto_translate:
             return False
-            
-        translation_service = TranslationService()
-        
-        if isinstance(source_value, QuillField) or field_name == 'answer':
-            html_content = self._get_quill_html(source_value)
-            translated_text = translation_service.translate_html(
-                html_content,
-                target_lang
-            )
-            
-            if translated_text:
-                if hasattr(translated_text, 'text'):
-                    translated_text = translated_text.text
-                
-                translated_data = {
-                    "delta": {"ops": [{"insert": f"{translated_text}\n"}]},
-                    "html": translated_text
-                }
-                target_field = f"{field_name}_{target_lang}"
-                setattr(self, target_field, json.dumps(translated_data))
-                self.last_translated = timezone.now()
-                return True
+        
+        return bool(FAQ.update_translations_bulk([self], fields, languages))
+    
+    def _prepare_translation(self, field_name, languages):
+        """
+        Split a field into segments and list the text runs that need translating.
+        
+        Only text runs are sent, and only for segments without a stored
+        translation. The delta is rebuilt from the same runs, so only delta
+        lines with no counterpart in the HTML are sent on their own.
+        """
+        text = self._get_source_text(field_name)
+        if not text:
+            return None, []
+        
+        if field_name == 'answer':
+            blocks = split_blocks(text)
+            delta = self._get_quill_delta(self.answer)
         else:
-            translated_text = translation_service.translate_text(
-                str(source_value),
-                target_lang
-            )
-            
-            if translated_text:
-                if hasattr(translated_text, 'text'):
-                    translated_text = translated_text.text
-                    
-                target_field = f"{field_name}_{target_lang}"
-                setattr(self, target_field, translated_text)
-                self.last_translated = timezone.now()
-                return True
-            
-        return False
-    
-    def update_translations(self, fields=None):
-        """Update translations for all or specific fields"""
-        if not self.auto_translate:
-            return
-            
+            blocks = [text]
+            delta = None
+        known = self._get_known_segments(field_name, languages)
+        
+        texts, block_runs = [], set()
+        for block in blocks:
+            runs = html_text_runs(block) if field_name == 'answer' else [block.strip()]
+            block_runs.update(runs)
+            stored = known.get(segment_hash(block), {})
+            if block.strip() and any(lang not in stored for lang in languages):
+                texts.extend(runs)
+        if delta:
+            texts.extend(run for run in delta_text_runs(delta) if run not in block_runs)
+        return (blocks, known, delta), texts
+    
+    def _assemble_translation(self, field_name, lang, prepared, translations):
+        """Rebuild a field from stored and freshly translated segments"""
+        blocks, known, delta = prepared
+        segments = []
+        # Runs of stored segments, so the delta matches the HTML built from them
+        known_runs = {}
+        for block in blocks:
+            source_hash = segment_hash(block)
+            text = known.get(source_hash, {}).get(lang)
+            if text is not None and delta:
+                source_runs, translated_runs = html_text_runs(block), html_text_runs(text)
+                if len(source_runs) == len(translated_runs):
+                    known_runs.update(zip(source_runs, translated_runs))
+            elif text is None and field_name == 'answer':
+                text = translate_html_runs(block, translations)
+            elif text is None:
+                text = translate_plain(block, translations)
+            if text is None:
+                return False
+            segments.append((source_hash, text))
+        
+        translated_delta = (
+            translate_delta(delta, ChainMap(known_runs, translations)) if delta else None
+        )
+        return self._apply_translation(field_name, lang, segments, translated_delta)
+    
+    @classmethod
+    def update_translations_bulk(cls, faqs, fields=None, languages=None):
+        """
+        Translate several FAQs through a single TranslationService batch.
+        
+        The provider requests for all FAQs, fields and languages are sent
+        concurrently, and nothing is set on an instance until every request
+        has finished. Translations are not saved. Returns a list of
+        (faq, field, language) tuples for the translations that were set.
+        """
         fields_to_translate = fields or ['question', 'answer']
-        target_languages = ['hi', 'bn']
+        target_languages = languages or TranslationService.get_target_languages()
+        
+        targets = []
+        texts = []
+        for faq in faqs:
+            if not faq.auto_translate:
+                continue
+            for field in fields_to_translate:
+                prepared, field_texts = faq._prepare_translation(field, target_languages)
+                if prepared:
+                    targets.append((faq, field, prepared))
+                    texts.extend(field_texts)
         
-        for field in fields_to_translate:
+        if not targets:
+            return []
+        
+        texts = list(dict.fromkeys(texts))
+        results = TranslationService().translate_batch(texts, target_languages) if texts else []
+        translations_by_lang = {
+            lang: {text: result.get(lang) for text, result in zip(texts, results)}
+            for lang in target_languages
+        }
+        
+        translated = []
+        for faq, field, prepared in targets:
             for lang in target_languages:
-                self.translate_field(field, lang)
+                if faq._assemble_translation(field, lang, prepared, translations_by_lang[lang]):
+                    translated.append((faq, field, lang))
+        return translated
+    
+    def queue_translations(self, fields=None, languages=None):
+        """Translate now, or record pending jobs when translation runs in the background"""
+        if not self.auto_translate:
+            return
+        
+        if getattr(settings, 'TRANSLATION_ASYNC', True) and self.pk:
+            TranslationJob.enqueue([self], fields, languages)
+        else:
+            self.update_translations(fields, languages)
+    
+    def _resolve_translated_text(self, field_name, language_code):
+        """
+        Read a field in a language from the database, falling back to English
+        
+        Reads never translate or queue anything; missing translations are
+        queued when the FAQ is saved.
+        """
+        if language_code == 'en':
+            return getattr(self, field_name)
+        
+        translation = self.get_translation(language_code)
+        value = getattr(translation, field_name) if translation else None
+        return value or getattr(self, field_name)
     
     def get_translated_text(self, field_name, language_code):
         """Get translated text for a field and language, using cache"""
+        prefetched = self.__dict__.get('_translated_text', {})
+        if (field_name, language_code) in prefetched:
+            return prefetched[(field_name, language_code)]
+        
         cache_key = self._get_cache_key(field_name, language_code)
         
-        cached_value = cache.get(cache_key)
+        cached_value = cache_get(cache_key)
         if cached_value is not None:
             return cached_value
         
-        if language_code == 'en':
-            value = getattr(self, field_name)
-        else:
-            translated_field = f"{field_name}_{language_code}"
-            value = getattr(self, translated_field, None)
-            
-            if not value and self.auto_translate:
-                self.translate_field(field_name, language_code)
-                value = getattr(self, translated_field, None)
-            
-            if not value:
-                value = getattr(self, field_name)
-        
-        cache.set(cache_key, value, timeout=getattr(settings, 'CACHE_TTL', 60 * 15))
+        value = self._resolve_translated_text(field_name, language_code)
+        cache_set(cache_key, value)
         return value
     
+    @classmethod
+    def prefetch_translated_text(cls, faqs, fields, language_code):
+        """
+        Load the translated text of several FAQs with one cache read.
+        
+        Misses are resolved from the database and written back with one
+        set_many. Later get_translated_text() calls on these instances make
+        no cache requests.
+        """
+        keys = {
+            faq._get_cache_key(field, language_code): (faq, field)
+            for faq in faqs
+            for field in fields
+        }
+        cached = cache_get_many(keys)
+        
+        missing = {}
+        for key, (faq, field) in keys.items():
+            value = cached.get(key)
+            if value is None:
+                value = missing[key] = faq._resolve_translated_text(field, language_code)
+            faq.__dict__.setdefault('_translated_text', {})[(field, language_code)] = value
+        
+        if missing:
+            cache_set_many(missing)
+    
+    def clear_cache(self):
+        """Invalidate cached FAQ values; saves and deletes already do this"""
+        invalidate()
+    
+    def render_answer(self):
+        """Refresh answer_html from the answer"""
+        self.answer_html = sanitize_html(self._get_source_text('answer'))
+    
     def save(self, *args, **kwargs):
-        is_new = self.pk is None
+        update_fields = kwargs.get('update_fields')
         
-        if not is_new:
-            languages = ['en', 'hi', 'bn']
-            fields = ['question', 'answer']
-            
-            for lang in languages:
-                for field in fields:
-                    cache_key = self._get_cache_key(field, lang)
-                    cache.delete(cache_key)
+        # Only English text that actually changed is translated again
+        changed_fields = [
+            field for field in self.get_changed_source_fields()
+            if update_fields is None or field in update_fields
+        ]
+        translate = self.auto_translate and bool(changed_fields)
+        is_async = getattr(settings, 'TRANSLATION_ASYNC', True)
+        derived_fields = set()
+        
+        if 'answer' in changed_fields:
+            self.render_answer()
+            derived_fields.add('answer_html')
+        
+        if translate and not is_async:
+            # Translate before writing so the translations are stored with this save
+            self.update_translations(changed_fields)
+            derived_fields.add('last_translated')
+        
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *derived_fields}
         
         super().save(*args, **kwargs)
+        # Writing translations reindexes the FAQ in every language already
+        if not self.save_translations() and changed_fields:
+            FAQSearchDocument.reindex([self.pk])
+        self._remember_source(changed_fields)
+        self.__dict__.pop('_translated_text', None)
         
-        if self.auto_translate:
-            self.update_translations()
+        if translate and is_async:
+            TranslationJob.enqueue([self], changed_fields)
 
 
-@receiver(pre_save, sender=FAQ)
-def update_translations_on_change(sender, instance, **kwargs):
-    """Update translations when English content changes"""
-    if instance.pk:
-        try:
-            old_instance = FAQ.objects.get(pk=instance.pk)
-            fields_to_translate = []
-            
-            if old_instance.question != instance.question:
-                fields_to_translate.append('question')
-            if old_instance.answer != instance.answer:
-                fields_to_translate.append('answer')
-            
-            if fields_to_translate and instance.auto_translate:
-                instance.update_translations(fields_to_translate)
-        except FAQ.DoesNotExist:
-            pass
+class FAQTranslation(models.Model):
+    """Question and answer of an FAQ in one target language"""
+    faq = models.ForeignKey(FAQ, on_delete=models.CASCADE, related_name='translations')
+    lang = models.CharField(max_length=10, verbose_name="Language")
+    question = models.TextField(blank=True, null=True)
+    answer = QuillField(blank=True, null=True)
+    answer_html = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="Sanitized HTML of the answer, rendered when it is saved"
+    )
+    source_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        help_text="Digest of the English content this translation was made from"
+    )
+    segments = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Per-segment source hashes and translations, by field"
+    )
+    translated_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    is_dirty = False
+    
+    objects = CorpusQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = "FAQ Translation"
+        verbose_name_plural = "FAQ Translations"
+        ordering = ['lang']
+        constraints = [
+            models.UniqueConstraint(fields=['lang', 'faq'], name='unique_faq_translation')
+        ]
+    
+    def __str__(self):
+        return f"{self.lang}: {self.question or ''}"[:100]
+    
+    def render_answer(self):
+        """Refresh answer_html from the answer"""
+        self.answer_html = sanitize_html(get_quill_html(self.answer))
+    
+    def save(self, *args, **kwargs):
+        self.render_answer()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'answer' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'answer_html'}
+        super().save(*args, **kwargs)
+        FAQSearchDocument.reindex([self.faq_id])
+    
+    @classmethod
+    def upsert(cls, translations):
+        """
+        Insert or update translations in one query, keyed by (faq, lang)
+        
+        Their FAQs are reindexed for search. Returns the number written.
+        """
+        translations = list(translations)
+        if not translations:
+            return 0
+        
+        for translation in translations:
+            translation.render_answer()
+        cls.objects.bulk_create(
+            translations,
+            update_conflicts=True,
+            unique_fields=['faq', 'lang'],
+            update_fields=[
+                'question', 'answer', 'answer_html', 'source_hash', 'segments', 'translated_at'
+            ]
+        )
+        for translation in translations:
+            translation.is_dirty = False
+        FAQSearchDocument.reindex(translation.faq_id for translation in translations)
+        return len(translations)
+
+
+# Text search configuration per language on PostgreSQL; others use 'simple'
+SEARCH_CONFIGS = {'en': 'english'}
+SEARCH_DEFAULT_CONFIG = 'simple'
+SEARCH_FTS_TABLE = 'faqs_faqsearch_fts'
+
+
+class SearchDocumentQuerySet(models.QuerySet):
+    def search(self, query, language_code=None):
+        """
+        Documents containing every word of query, best first, with a rank
+        
+        SQLite matches the FTS5 table created by migration 0010 and PostgreSQL
+        the GIN indexes over to_tsvector(content) created by migration 0012.
+        Other databases fall back to unindexed substring matching.
+        """
+        words = query.split()
+        queryset = self if language_code is None else self.filter(lang=language_code)
+        if not words:
+            return queryset.none()
+        
+        table = self.model._meta.db_table
+        vendor = connections[self.db].vendor
+        if vendor == 'postgresql':
+            queryset = self._match_tsvector(queryset, query, language_code)
+        elif vendor == 'sqlite':
+            # Every word as a quoted FTS5 string, so operators in it are plain text
+            match = ' '.join('"{}"'.format(word.replace('"', '""')) for word in words)
+            queryset = queryset.filter(id__in=RawSQL(
+                f'SELECT rowid FROM {SEARCH_FTS_TABLE} WHERE {SEARCH_FTS_TABLE} MATCH %s', (match,)
+            )).annotate(rank=RawSQL(
+                f'SELECT -bm25({SEARCH_FTS_TABLE}) FROM {SEARCH_FTS_TABLE} '
+                f'WHERE {SEARCH_FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+                (match,),
+                output_field=models.FloatField()
+            ))
+        else:
+            for word in words:
+                queryset = queryset.filter(content__icontains=word)
+            queryset = queryset.annotate(rank=models.Value(0.0, output_field=models.FloatField()))
+        return queryset.order_by('-rank', 'faq_id')
+    
+    @staticmethod
+    def _match_tsvector(queryset, query, language_code):
+        """
+        Filter and rank on PostgreSQL with web search syntax
+        
+        The to_tsvector() expressions match the partial indexes of migration
+        0012 exactly, one per text search configuration, so they are used.
+        """
+        # django.contrib.postgres needs the PostgreSQL driver, so it is only imported here
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, SearchVector, SearchVectorExact
+        )
+        
+        def match(config):
+            vector = SearchVector('content', config=config)
+            tsquery = SearchQuery(query, config=config, search_type='websearch')
+            return SearchVectorExact(vector, tsquery), SearchRank(vector, tsquery)
+        
+        if language_code is not None:
+            matches, rank = match(SEARCH_CONFIGS.get(language_code, SEARCH_DEFAULT_CONFIG))
+            return queryset.filter(matches).annotate(rank=rank)
+        
+        branches = [(models.Q(lang=lang), config) for lang, config in SEARCH_CONFIGS.items()]
+        branches.append((~models.Q(lang__in=list(SEARCH_CONFIGS)), SEARCH_DEFAULT_CONFIG))
+        condition, ranks = models.Q(), []
+        for language, config in branches:
+            matches, rank = match(config)
+            condition |= language & models.Q(matches)
+            ranks.append(models.When(language, then=rank))
+        return queryset.filter(condition).annotate(
+            rank=models.Case(*ranks, output_field=models.FloatField())
+        )
+
+
+class FAQSearchDocument(models.Model):
+    """
+    Searchable plain text of an FAQ in one language
+    
+    Rows are rewritten whenever an FAQ or its translations are; the database
+    keeps the full-text index over content up to date.
+    """
+    faq = models.ForeignKey(FAQ, on_delete=models.CASCADE, related_name='search_documents')
+    lang = models.CharField(max_length=10)
+    content = models.TextField()
+    
+    objects = SearchDocumentQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = "FAQ Search Document"
+        verbose_name_plural = "FAQ Search Documents"
+        constraints = [
+            models.UniqueConstraint(fields=['faq', 'lang'], name='unique_faq_search_document')
+        ]
+    
+    def __str__(self):
+        return f"{self.lang}: {self.content[:100]}"
+    
+    @classmethod
+    def reindex(cls, faq_ids):
+        """
+        Rewrite the documents of some FAQs in every language, as they are
+        served: missing or empty translated fields fall back to English
+        """
+        faq_ids = list(set(faq_ids))
+        if not faq_ids:
+            return
+        translations = {
+            (faq_id, lang): (question, answer_html)
+            for faq_id, lang, question, answer_html in FAQTranslation.objects.filter(
+                faq_id__in=faq_ids
+            ).values_list('faq_id', 'lang', 'question', 'answer_html')
+        }
+        documents = []
+        rows = FAQ.objects.filter(pk__in=faq_ids).values_list('id', 'question', 'answer_html')
+        for faq_id, question, answer_html in rows:
+            for lang in TranslationService.get_languages():
+                translated = translations.get((faq_id, lang), (None, None))
+                documents.append(cls(
+                    faq_id=faq_id,
+                    lang=lang,
+                    content=search_text(translated[0] or question, translated[1] or answer_html)
+                ))
+        cls.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=['faq', 'lang'],
+            update_fields=['content']
+        )
+
+
+@receiver([post_save, post_delete], sender=FAQ)
+@receiver([post_save, post_delete], sender=FAQTranslation)
+def invalidate_cache_on_write(sender, using=None, **kwargs):
+    """Any write to an FAQ or a translation starts a new cache generation"""
+    invalidate(using)
+
+
+@receiver(post_delete, sender=FAQTranslation)
+def reindex_on_translation_delete(sender, instance, origin=None, **kwargs):
+    """The FAQ falls back to English in that language, unless it is being deleted too"""
+    if isinstance(origin, FAQ) or getattr(origin, 'model', None) is FAQ:
+        return
+    FAQSearchDocument.reindex([instance.faq_id])
+
 
 class SimpleQuestion(models.Model):
     """A simplified model for basic testing without Quill fields"""
@@ -190,3 +775,87 @@ class SimpleQuestion(models.Model):
         verbose_name = "Simple Question"
         verbose_name_plural = "Simple Questions"
         ordering = ['-created_at']
+
+
+class TranslationMemory(models.Model):
+    """Translations keyed by a stable digest of the full source text"""
+    source_hash = models.CharField(max_length=64, unique=True)
+    source_text = models.TextField()
+    target_lang = models.CharField(max_length=10)
+    provider = models.CharField(max_length=50)
+    translated_text = models.TextField()
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.target_lang}: {self.source_text[:50]}"
+
+    class Meta:
+        verbose_name = "Translation Memory Entry"
+        verbose_name_plural = "Translation Memory"
+
+
+class TranslationJob(models.Model):
+    """A pending translation of one FAQ field into one language"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    faq = models.ForeignKey(FAQ, on_delete=models.CASCADE, related_name='translation_jobs')
+    field = models.CharField(max_length=20)
+    language = models.CharField(max_length=10)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"FAQ {self.faq_id}: {self.field} -> {self.language} ({self.status})"
+
+    @classmethod
+    def enqueue(cls, faqs, fields=None, languages=None):
+        """
+        Record pending jobs for the given FAQs.
+
+        A job that already exists for the same (faq, field, language) is reset
+        to pending instead of being duplicated.
+        """
+        fields = fields or ['question', 'answer']
+        languages = languages or TranslationService.get_target_languages()
+        now = timezone.now()
+
+        jobs = [
+            cls(faq=faq, field=field, language=lang, available_at=now)
+            for faq in faqs
+            for field in fields
+            for lang in languages
+        ]
+        cls.objects.bulk_create(
+            jobs,
+            update_conflicts=True,
+            unique_fields=['faq', 'field', 'language'],
+            update_fields=['status', 'attempts', 'last_error', 'available_at', 'updated_at']
+        )
+
+    class Meta:
+        verbose_name = "Translation Job"
+        verbose_name_plural = "Translation Jobs"
+        ordering = ['available_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['faq', 'field', 'language'],
+                name='unique_translation_job'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='translation_job_queue_idx')
+        ]
+
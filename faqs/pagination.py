@@ -0,0 +1,48 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from urllib.parse import urlencode
+
+
+class _QueryParams:
+    """The parts of a request a paginator reads, built from plain values"""
+
+    def __init__(self, params):
+        self.query_params = {name: value for name, value in params.items() if value is not None}
+
+    def build_absolute_uri(self):
+        # Relative to the page it is found on, whatever host or path that was
+        return '?' + urlencode(self.query_params)
+
+
+class FAQCursorPagination(CursorPagination):
+    """
+    Keyset pagination over active FAQs, newest first
+
+    The id breaks ties between FAQs created at the same moment, and the
+    partial index on (created_at, id) serves every page with a range scan.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'FAQ_PAGE_SIZE', 50)
+
+    def paginate_params(self, queryset, params):
+        """
+        paginate_queryset() from plain query parameters instead of a request
+
+        The next and previous links are relative ("?cursor=...&lang=hi") and
+        carry only the given params, so a page can be cached and served to
+        any host.
+        """
+        return self.paginate_queryset(queryset, _QueryParams(params))
+
+
+class FAQSearchPagination(PageNumberPagination):
+    """Numbered pages of search results, which are ordered by rank"""
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'FAQ_PAGE_SIZE', 50)
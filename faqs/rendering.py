@@ -0,0 +1,72 @@
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from .models import FAQ
+from .pagination import FAQCursorPagination
+from .serializers import FAQListSerializer
+import gzip
+import hashlib
+
+
+def render_entry(body: bytes) -> dict:
+    """
+    Cacheable JSON body with its ETag
+
+    Bodies of FAQ_CACHE_GZIP_MIN_SIZE bytes or more are also kept gzipped,
+    so either encoding is served without compressing or inflating anything.
+    Only bodies of FAQ_CACHE_GZIP_ONLY_MIN_SIZE bytes or more are kept
+    gzipped alone; clients that do not accept gzip get those inflated.
+    """
+    entry = {'etag': hashlib.md5(body).hexdigest(), 'body': body, 'gzip': None}
+    if len(body) >= getattr(settings, 'FAQ_CACHE_GZIP_MIN_SIZE', 200):
+        entry['gzip'] = gzip.compress(body, mtime=0)
+        if len(body) >= getattr(settings, 'FAQ_CACHE_GZIP_ONLY_MIN_SIZE', 1024 * 1024):
+            entry['body'] = None
+    return entry
+
+
+def entry_body(entry: dict) -> bytes:
+    """The uncompressed body of a rendered entry"""
+    return entry['body'] if entry['body'] is not None else gzip.decompress(entry['gzip'])
+
+
+def list_queryset(language: str, fields=None):
+    """Flat rows of active FAQs in one language, narrowed to a ?fields= fieldset"""
+    queryset = FAQ.objects.filter(is_active=True).for_language(language)
+    if fields is not None:
+        # The cursor is always built from (created_at, id)
+        queryset = queryset.values(
+            'id', 'created_at', *(FAQListSerializer.FIELDS[name] for name in fields)
+        )
+    return queryset
+
+
+def build_page(language: str, cursor, page_size: int, fields=None) -> dict:
+    """
+    Rendered list page from the values its cache key is made of
+
+    Links carry only those values, never the Host header or other query
+    parameters of the request that happened to build the page. Nothing
+    of a request or a view is used, as the page may be rebuilt in the
+    background after the request has finished, or by the cache warmer.
+    """
+    paginator = FAQCursorPagination()
+    page = paginator.paginate_params(list_queryset(language, fields), {
+        'lang': language,
+        'page_size': page_size,
+        'fields': ','.join(fields) if fields is not None else None,
+        paginator.cursor_query_param: cursor,
+    })
+    serializer = FAQListSerializer(page, many=True, fields=fields)
+    return render_entry(
+        JSONRenderer().render(paginator.get_paginated_response(serializer.data).data)
+    )
+
+
+def render_language(rows) -> dict:
+    """Rendered entry of a language's full list from FAQ.objects.for_language() rows"""
+    return render_entry(JSONRenderer().render(FAQListSerializer(rows, many=True).data))
+
+
+def build_language(language: str) -> dict:
+    """Rendered full list of active FAQs in one language"""
+    return render_language(FAQ.objects.filter(is_active=True).for_language(language))
@@ -0,0 +1,199 @@
+from collections import deque
+from typing import Callable, Optional
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderUnavailable(Exception):
+    """Raised when a provider call is refused or every attempt has failed"""
+
+
+class Deadline:
+    """A time budget shared by every call made on behalf of one request"""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take a token, waiting up to `timeout` seconds (forever if None)"""
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if give_up_at is not None:
+                left = give_up_at - time.monotonic()
+                if left <= 0:
+                    return False
+                wait = min(wait, left)
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Fails fast after `failure_threshold` consecutive failures
+
+    After `reset_timeout` seconds one trial call is let through; its outcome
+    closes the circuit again or keeps it open for another period.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, window: int = 50):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._outcomes = deque(maxlen=window)  # True for success, False for failure
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            cooled_down = time.monotonic() - self._opened_at >= self.reset_timeout
+            if self._state == self.OPEN and cooled_down:
+                return self.HALF_OPEN
+            return self._state
+
+    @property
+    def failure_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return True
+
+    def release_trial(self):
+        """Give back the half-open trial slot of a call that never ran"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._outcomes.append(True)
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+            self._state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._outcomes.append(False)
+            self._consecutive_failures += 1
+            self._trial_in_flight = False
+            tripped = self._consecutive_failures >= self.failure_threshold
+            if self._state == self.HALF_OPEN or tripped:
+                if self._state != self.OPEN:
+                    logger.warning("Translation provider circuit opened")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the given zero-based attempt"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class ResilientProvider:
+    """Wraps provider calls with rate limiting, a circuit breaker, retries and deadlines"""
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: int = 10,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0
+    ):
+        self.limiter = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+    def call(self, func: Callable, deadline: Optional[Deadline] = None):
+        """Run `func`, retrying failures until it succeeds or the budget is spent"""
+        last_error = None
+        for attempt in range(self.max_retries):
+            if deadline is not None and deadline.expired():
+                raise ProviderUnavailable('deadline exceeded')
+            if not self.breaker.allow():
+                raise ProviderUnavailable('circuit open')
+            if not self.limiter.acquire(timeout=deadline.remaining() if deadline else None):
+                # The trial call, if this was one, never reached the provider
+                self.breaker.release_trial()
+                raise ProviderUnavailable('rate limit wait exceeded deadline')
+
+            try:
+                result = func()
+            except Exception as e:
+                self.breaker.record_failure()
+                last_error = e
+                logger.warning(f"Translation attempt {attempt + 1} failed: {str(e)}")
+            else:
+                self.breaker.record_success()
+                return result
+
+            if attempt < self.max_retries - 1:
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                if deadline is not None:
+                    delay = min(delay, deadline.remaining())
+                time.sleep(delay)
+
+        raise ProviderUnavailable(f'all {self.max_retries} attempts failed: {last_error}')
+
+    def state(self) -> dict:
+        """Snapshot of the limiter and breaker for monitoring"""
+        return {
+            'circuit': self.breaker.state,
+            'tokens': round(self.limiter.tokens, 2),
+            'failure_rate': round(self.breaker.failure_rate, 3),
+        }
@@ -0,0 +1,260 @@
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import hashlib
+import re
+
+# Top-level block elements produced by the Quill editor
+BLOCK_PATTERN = re.compile(
+    r'<(p|h[1-6]|ol|ul|blockquote|pre|div)\b[^>]*>.*?</\1\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def split_blocks(html: str) -> List[str]:
+    """
+    Split HTML into top-level blocks (paragraphs, headings, lists...)
+
+    Anything between blocks is kept as its own segment, so joining the
+    result gives back the original HTML unchanged.
+    """
+    if not html:
+        return []
+
+    segments = []
+    position = 0
+    for match in BLOCK_PATTERN.finditer(html):
+        if match.start() > position:
+            segments.append(html[position:match.start()])
+        segments.append(match.group(0))
+        position = match.end()
+
+    if position < len(html):
+        segments.append(html[position:])
+    return segments
+
+
+# Markup the Quill editor produces; anything else is dropped when rendering
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'h1', 'h2', 'h3', 'h4',
+    'h5', 'h6', 'i', 'img', 'li', 'ol', 'p', 'pre', 's', 'span', 'strike',
+    'strong', 'sub', 'sup', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    '*': {'class'},
+    'a': {'href', 'rel', 'target'},
+    'img': {'alt', 'src'},
+}
+VOID_TAGS = {'br', 'img'}
+# Elements removed together with their content
+DROPPED_TAGS = {'embed', 'iframe', 'noscript', 'object', 'script', 'style', 'template'}
+SAFE_URL_SCHEMES = {'', 'http', 'https', 'mailto', 'tel'}
+
+
+def segment_hash(text: str) -> str:
+    """Stable digest used to recognise an unchanged segment"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+class _TextRunParser(HTMLParser):
+    """Splits HTML into raw markup and the text runs between tags"""
+
+    RAW_TEXT_TAGS = {'script', 'style'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []  # (is_text, value) pairs
+        self._raw_depth = 0
+
+    def _markup(self, value):
+        self.parts.append((False, value))
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.RAW_TEXT_TAGS:
+            self._raw_depth += 1
+        self._markup(self.get_starttag_text())
+
+    def handle_startendtag(self, tag, attrs):
+        self._markup(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if tag in self.RAW_TEXT_TAGS and self._raw_depth:
+            self._raw_depth -= 1
+        self._markup(f'</{tag}>')
+
+    def handle_comment(self, data):
+        self._markup(f'<!--{data}-->')
+
+    def handle_decl(self, decl):
+        self._markup(f'<!{decl}>')
+
+    def handle_data(self, data):
+        if self._raw_depth:
+            self._markup(data)
+        elif self.parts and self.parts[-1][0]:
+            self.parts[-1] = (True, self.parts[-1][1] + data)
+        else:
+            self.parts.append((True, data))
+
+
+def _is_safe_url(name: str, value: str) -> bool:
+    # Browsers ignore whitespace and control characters inside a scheme
+    url = re.sub(r'[\x00-\x20]+', '', value).lower()
+    if name == 'src' and url.startswith('data:image/'):
+        return True
+    return urlsplit(url).scheme in SAFE_URL_SCHEMES
+
+
+class _Sanitizer(HTMLParser):
+    """Rebuilds HTML keeping only allowed tags, attributes and URLs"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.output = []
+        self.open_tags = []
+        self._dropped_depth = 0
+
+    def _attributes(self, tag, attrs):
+        allowed = ALLOWED_ATTRIBUTES['*'] | ALLOWED_ATTRIBUTES.get(tag, set())
+        return ''.join(
+            f' {name}="{escape(value)}"'
+            for name, value in attrs
+            if name in allowed and value is not None
+            and (name not in ('href', 'src') or _is_safe_url(name, value))
+        )
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            self._dropped_depth += 1
+        elif not self._dropped_depth and tag in ALLOWED_TAGS:
+            self.output.append(f'<{tag}{self._attributes(tag, attrs)}>')
+            if tag not in VOID_TAGS:
+                self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self._dropped_depth = max(self._dropped_depth - 1, 0)
+        elif not self._dropped_depth and tag in self.open_tags:
+            # Close anything left open inside this element as well
+            while self.open_tags:
+                open_tag = self.open_tags.pop()
+                self.output.append(f'</{open_tag}>')
+                if open_tag == tag:
+                    break
+
+    def handle_data(self, data):
+        if not self._dropped_depth:
+            self.output.append(escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        self.output.extend(f'</{tag}>' for tag in reversed(self.open_tags))
+        self.open_tags = []
+
+
+def sanitize_html(html: str) -> str:
+    """
+    Make editor HTML safe to serve as-is
+
+    Tags and attributes outside the Quill allow-list are removed, along with
+    scripts, styles, comments and unsafe URLs such as javascript:. Text is
+    re-escaped and unclosed elements are closed.
+    """
+    if not html:
+        return ''
+    sanitizer = _Sanitizer()
+    sanitizer.feed(html)
+    sanitizer.close()
+    return ''.join(sanitizer.output)
+
+
+def _parse_text_runs(html: str) -> List[Tuple[bool, str]]:
+    parser = _TextRunParser()
+    parser.feed(html)
+    parser.close()
+    return parser.parts
+
+
+def _translate_run(text: str, translations: Dict[str, Optional[str]]) -> Optional[str]:
+    """Translate one run, keeping its leading and trailing whitespace"""
+    core = text.strip()
+    if not core:
+        return text
+    translated = translations.get(core)
+    if not translated:
+        return None
+    start = text.index(core)
+    return text[:start] + translated + text[start + len(core):]
+
+
+def html_text_runs(html: str) -> List[str]:
+    """Text that needs translating in an HTML fragment, without any markup"""
+    return [
+        value.strip()
+        for is_text, value in _parse_text_runs(html)
+        if is_text and value.strip()
+    ]
+
+
+def search_text(question: Optional[str], answer_html: Optional[str]) -> str:
+    """Plain text of a question and its answer, as stored in the search index"""
+    return '\n'.join(filter(None, [question, ' '.join(html_text_runs(answer_html or ''))]))
+
+
+def translate_html_runs(html: str, translations: Dict[str, Optional[str]]) -> Optional[str]:
+    """
+    Rebuild an HTML fragment with its text runs replaced by translations
+
+    Markup is copied through untouched. Returns None if any run is missing
+    from translations.
+    """
+    result = []
+    for is_text, value in _parse_text_runs(html):
+        if not is_text:
+            result.append(value)
+            continue
+        translated = _translate_run(value, translations)
+        if translated is None:
+            return None
+        result.append(escape(translated, quote=False))
+    return ''.join(result)
+
+
+def translate_plain(text: str, translations: Dict[str, Optional[str]]) -> Optional[str]:
+    """Translate a plain-text value, keeping its surrounding whitespace"""
+    return _translate_run(text, translations)
+
+
+def delta_text_runs(delta: Dict) -> List[str]:
+    """Lines of text held in the insert ops of a Quill delta"""
+    runs = []
+    for op in delta.get('ops', []):
+        insert = op.get('insert')
+        if isinstance(insert, str):
+            runs.extend(line.strip() for line in insert.split('\n') if line.strip())
+    return runs
+
+
+def translate_delta(delta: Dict, translations: Dict[str, Optional[str]]) -> Optional[Dict]:
+    """
+    Copy a Quill delta with every text insert translated
+
+    Attributes and embeds are kept as they are, so formatting survives.
+    Returns None if any line is missing from translations.
+    """
+    ops = []
+    for op in delta.get('ops', []):
+        insert = op.get('insert')
+        if isinstance(insert, str):
+            lines = [_translate_run(line, translations) for line in insert.split('\n')]
+            if any(line is None for line in lines):
+                return None
+            op = dict(op, insert='\n'.join(lines))
+        ops.append(op)
+    return {'ops': ops}
@@ -1,33 +1,153 @@
-from rest_framework import serializers
-from .models import FAQ
+from django.conf import settings
+from django.db.models.manager import BaseManager
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from .models import FAQ, FAQTranslation
+from .services import TranslationService
+
+class FAQBatchListSerializer(serializers.ListSerializer):
+    """Fetches the cached translations of the whole list with one cache read"""
+    def to_representation(self, data):
+        faqs = list(data.all() if isinstance(data, BaseManager) else data)
+        FAQ.prefetch_translated_text(
+            faqs, ['question', 'answer_html'], self.child.context.get('language', 'en')
+        )
+        return super().to_representation(faqs)
 
 class FAQSerializer(serializers.ModelSerializer):
     """Serializer for FAQ model with language-based translations"""
     question = serializers.SerializerMethodField()
     answer = serializers.SerializerMethodField()
-    
+
     class Meta:
         model = FAQ
         fields = ['id', 'question', 'answer', 'created_at', 'updated_at', 'is_active']
         read_only_fields = ['created_at', 'updated_at']
-    
+        list_serializer_class = FAQBatchListSerializer
+
     def get_question(self, obj):
         lang = self.context.get('language', 'en')
         return obj.get_translated_text('question', lang)
-    
+
     def get_answer(self, obj):
         lang = self.context.get('language', 'en')
-        answer = obj.get_translated_text('answer', lang)
-        return answer.html if hasattr(answer, 'html') else str(answer)
+        return obj.get_translated_text('answer_html', lang)
+
+def datetime_formatter():
+    """
+    Format datetimes exactly like serializers.DateTimeField, with the
+    timezone and output format looked up once instead of per value
+    """
+    field = serializers.DateTimeField()
+    if (api_settings.DATETIME_FORMAT or '').lower() != ISO_8601 or not settings.USE_TZ:
+        return field.to_representation
+    current_timezone = timezone.get_current_timezone()
+
+    def format_datetime(value):
+        if not value or not timezone.is_aware(value):
+            return field.to_representation(value)
+        value = value.astimezone(current_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    return format_datetime
+
+class FAQListSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer for the flat rows of FAQ.objects.for_language()
+
+    Gives the same JSON as FAQSerializer without DRF's per-field machinery:
+    the accessors for the wanted fields are built once per serializer and
+    datetimes are formatted directly. `fields` keeps a subset of FIELDS.
+    """
+    # Output name -> row key
+    FIELDS = {
+        'id': 'id',
+        'question': 'translated_question',
+        'answer': 'translated_answer',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+        'is_active': 'is_active',
+    }
+    DATETIME_FIELDS = {'created_at', 'updated_at'}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        format_datetime = datetime_formatter()
+        self._accessors = [
+            (name, self.FIELDS[name], format_datetime if name in self.DATETIME_FIELDS else None)
+            for name in self.FIELDS
+            if fields is None or name in fields
+        ]
+
+    def to_representation(self, row):
+        representation = {}
+        for name, key, format_value in self._accessors:
+            value = row[key]
+            representation[name] = format_value(value) if format_value else value
+        return representation
+
+class FAQTranslationSerializer(serializers.ModelSerializer):
+    """Serializer for one language version of an FAQ"""
+    class Meta:
+        model = FAQTranslation
+        fields = ['lang', 'question', 'answer', 'translated_at']
+        read_only_fields = ['translated_at']
+
+    def validate_lang(self, value):
+        if value not in TranslationService.get_target_languages():
+            raise serializers.ValidationError(f"Unsupported language: {value}")
+        return value
 
 class FAQAdminSerializer(serializers.ModelSerializer):
     """Serializer for FAQ model with all fields for admin operations"""
+    translations = FAQTranslationSerializer(many=True, required=False)
+
     class Meta:
         model = FAQ
         fields = [
-            'id', 'question', 'answer',
-            'question_hi', 'answer_hi',
-            'question_bn', 'answer_bn',
+            'id', 'external_key', 'question', 'answer',
+            'translations',
             'is_active', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['created_at', 'updated_at'] 
\ No newline at end of file
+        read_only_fields = ['created_at', 'updated_at']
+
+    def _save_translations(self, faq, translations):
+        for data in translations:
+            translation = faq._get_or_build_translation(data['lang'])
+            for field in ('question', 'answer'):
+                if field in data:
+                    setattr(translation, field, data[field])
+            translation.is_dirty = True
+        faq.save_translations()
+
+    def create(self, validated_data):
+        translations = validated_data.pop('translations', [])
+        faq = super().create(validated_data)
+        self._save_translations(faq, translations)
+        return faq
+
+    def update(self, instance, validated_data):
+        translations = validated_data.pop('translations', [])
+        faq = super().update(instance, validated_data)
+        self._save_translations(faq, translations)
+        return faq
+
+class FAQBulkListSerializer(serializers.ListSerializer):
+    """Rejects payloads that name the same FAQ twice"""
+    def validate(self, attrs):
+        for field in ('id', 'external_key'):
+            values = [item[field] for item in attrs if item.get(field) is not None]
+            if len(values) != len(set(values)):
+                raise serializers.ValidationError(f"Duplicate {field} values in the payload")
+        return attrs
+
+class FAQBulkSerializer(FAQAdminSerializer):
+    """FAQ admin serializer for bulk upserts, where id and external_key select the FAQ"""
+    id = serializers.IntegerField(required=False, min_value=1)
+    external_key = serializers.CharField(
+        required=False, allow_null=True, allow_blank=True, max_length=255
+    )
+
+    class Meta(FAQAdminSerializer.Meta):
+        list_serializer_class = FAQBulkListSerializer
@@ -1,13 +1,23 @@
-from googletrans import Translator
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from django.apps import apps
+from django.conf import settings
 from django.core.cache import cache
-from typing import Dict, Optional
+from django.db.models import F
+from django.utils import timezone
+from typing import Dict, List, Optional, Sequence
+from .backends import get_backend
+from .resilience import Deadline, ProviderUnavailable, ResilientProvider
+from .richtext import html_text_runs, translate_html_runs
+import hashlib
 import logging
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
 class TranslationService:
-    """Service for handling translations using Google Translate"""
+    """Service for handling translations through the configured backend"""
     
     SUPPORTED_LANGUAGES = {
         'en': 'english',
@@ -15,44 +25,193 @@ class TranslationService:
         'bn': 'bengali'
     }
     
-    def __init__(self):
-        self.translator = Translator()
-        self.retry_count = 3
-        self.retry_delay = 1  # seconds
+    # Google's web endpoint rejects payloads much above 5000 characters
+    MAX_BATCH_CHARS = 4500
+    # Marker placed between texts sent in one request; survives translation intact
+    BATCH_SEPARATOR = '\n\n[[#]]\n\n'
+    BATCH_SPLIT_TOKEN = '[[#]]'
+    
+    MEMORY_CACHE_TIMEOUT = 86400  # seconds
+    
+    _provider = None
+    _provider_lock = threading.Lock()
+    
+    # Memory hits counted in this process and not yet written
+    _pending_hits = Counter()
+    _hits_lock = threading.Lock()
+    _hits_flushed_at = time.monotonic()
+    
+    def __init__(self, budget: Optional[float] = None):
+        """
+        Args:
+            budget: Seconds all provider calls made through this service may
+                take together, including retries (TRANSLATION_REQUEST_BUDGET
+                by default)
+        """
+        self.backend = get_backend()
+        self.provider = self._get_provider()
+        budget = budget or getattr(settings, 'TRANSLATION_REQUEST_BUDGET', 30)
+        self.deadline = Deadline(budget)
+    
+    @classmethod
+    def _get_provider(cls) -> ResilientProvider:
+        """Return the process-wide rate limiter and circuit breaker"""
+        if cls._provider is None:
+            with cls._provider_lock:
+                if cls._provider is None:
+                    cls._provider = ResilientProvider(
+                        rate=getattr(settings, 'TRANSLATION_RATE_LIMIT', 5.0),
+                        burst=getattr(settings, 'TRANSLATION_BURST', 10),
+                        max_retries=getattr(settings, 'TRANSLATION_MAX_RETRIES', 3),
+                        backoff_base=getattr(settings, 'TRANSLATION_BACKOFF_BASE', 0.5),
+                        backoff_cap=getattr(settings, 'TRANSLATION_BACKOFF_MAX', 8.0),
+                        failure_threshold=getattr(settings, 'TRANSLATION_BREAKER_THRESHOLD', 5),
+                        reset_timeout=getattr(settings, 'TRANSLATION_BREAKER_RESET', 30.0),
+                    )
+        return cls._provider
+    
+    @classmethod
+    def get_languages(cls) -> Dict[str, str]:
+        """Language codes served by the site, English first (FAQ_LANGUAGES setting)"""
+        return getattr(settings, 'FAQ_LANGUAGES', cls.SUPPORTED_LANGUAGES)
+    
+    @classmethod
+    def get_target_languages(cls) -> List[str]:
+        """Language codes that English content is translated into"""
+        return [code for code in cls.get_languages() if code != 'en']
+    
+    @classmethod
+    def get_provider_state(cls) -> dict:
+        """Circuit state, available tokens and recent failure rate of the provider"""
+        return cls._get_provider().state()
+    
+    def _get_source_hash(self, text: str, target_lang: str) -> str:
+        """Stable digest of the full source text, language and provider"""
+        payload = f'{self.backend.name}\x00{target_lang}\x00{text}'
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
     
     def _get_cache_key(self, text: str, target_lang: str) -> str:
         """Generate a cache key for translations"""
-        # Use first 50 chars of text to keep cache key reasonable
-        text_preview = text[:50] if text else ''
-        return f'trans:{target_lang}:{hash(text_preview)}'
+        return f'trans:{self._get_source_hash(text, target_lang)}'
     
-    def _translate_with_retry(self, text: str, target_lang: str) -> Optional[str]:
-        """Attempt translation with retries on failure"""
-        for attempt in range(self.retry_count):
-            try:
-                if attempt > 0:
-                    time.sleep(self.retry_delay)
-                
-                translation = self.translator.translate(
-                    text,
-                    dest=target_lang,
-                    src='en'
+    def _lookup_memory(self, texts: Sequence[str], target_lang: str) -> Dict[str, str]:
+        """Find known translations, checking the cache before the database"""
+        if not texts:
+            return {}
+        
+        TranslationMemory = apps.get_model('faqs', 'TranslationMemory')
+        texts_by_hash = {self._get_source_hash(text, target_lang): text for text in texts}
+        
+        cached = cache.get_many([f'trans:{source_hash}' for source_hash in texts_by_hash])
+        found = {
+            source_hash: cached[f'trans:{source_hash}']
+            for source_hash in texts_by_hash
+            if cached.get(f'trans:{source_hash}')
+        }
+        
+        missing = [source_hash for source_hash in texts_by_hash if source_hash not in found]
+        if missing:
+            stored = dict(
+                TranslationMemory.objects.filter(
+                    source_hash__in=missing
+                ).values_list('source_hash', 'translated_text')
+            )
+            if stored:
+                cache.set_many(
+                    {f'trans:{source_hash}': text for source_hash, text in stored.items()},
+                    timeout=self.MEMORY_CACHE_TIMEOUT
                 )
-                return translation.text
-                
-            except Exception as e:
-                logger.warning(
-                    f"Translation attempt {attempt + 1} failed: {str(e)}"
+            found.update(stored)
+        
+        if found:
+            self._count_hits(list(found))
+        
+        return {texts_by_hash[source_hash]: text for source_hash, text in found.items()}
+    
+    @classmethod
+    def _count_hits(cls, source_hashes: Sequence[str]) -> None:
+        """
+        Count memory hits without writing them on the lookup path
+        
+        The counts are written once TRANSLATION_MEMORY_FLUSH_SIZE entries
+        have been hit or TRANSLATION_MEMORY_FLUSH_INTERVAL seconds have passed.
+        """
+        with cls._hits_lock:
+            cls._pending_hits.update(source_hashes)
+            due = (
+                len(cls._pending_hits) >= getattr(settings, 'TRANSLATION_MEMORY_FLUSH_SIZE', 500)
+                or time.monotonic() - cls._hits_flushed_at
+                >= getattr(settings, 'TRANSLATION_MEMORY_FLUSH_INTERVAL', 60)
+            )
+        if due:
+            cls.flush_memory_hits()
+    
+    @classmethod
+    def flush_memory_hits(cls) -> None:
+        """Write the counted memory hits, one update per distinct count"""
+        with cls._hits_lock:
+            pending, cls._pending_hits = cls._pending_hits, Counter()
+            cls._hits_flushed_at = time.monotonic()
+        if not pending:
+            return
+        
+        TranslationMemory = apps.get_model('faqs', 'TranslationMemory')
+        hashes_by_count = defaultdict(list)
+        for source_hash, count in pending.items():
+            hashes_by_count[count].append(source_hash)
+        now = timezone.now()
+        for count, source_hashes in hashes_by_count.items():
+            TranslationMemory.objects.filter(source_hash__in=source_hashes).update(
+                hit_count=F('hit_count') + count,
+                last_used_at=now
+            )
+    
+    def _store_memory(self, translations: Dict[str, str], target_lang: str) -> None:
+        """Persist new translations to the database and the cache"""
+        if not translations:
+            return
+        
+        TranslationMemory = apps.get_model('faqs', 'TranslationMemory')
+        entries = {
+            self._get_source_hash(text, target_lang): (text, translated_text)
+            for text, translated_text in translations.items()
+        }
+        
+        TranslationMemory.objects.bulk_create(
+            [
+                TranslationMemory(
+                    source_hash=source_hash,
+                    source_text=text,
+                    target_lang=target_lang,
+                    provider=self.backend.name,
+                    translated_text=translated_text
                 )
-                if attempt == self.retry_count - 1:
-                    logger.error(
-                        f"All translation attempts failed for text: {text[:100]}..."
-                    )
-                    return None
+                for source_hash, (text, translated_text) in entries.items()
+            ],
+            ignore_conflicts=True
+        )
+        cache.set_many(
+            {
+                f'trans:{source_hash}': translated_text
+                for source_hash, (_, translated_text) in entries.items()
+            },
+            timeout=self.MEMORY_CACHE_TIMEOUT
+        )
+    
+    def _translate_with_retry(self, text: str, target_lang: str) -> Optional[str]:
+        """Attempt translation through the resilience layer"""
+        try:
+            return self.provider.call(
+                lambda: self.backend.translate(text, target_lang),
+                deadline=self.deadline
+            )
+        except ProviderUnavailable as e:
+            logger.error(f"Translation failed ({str(e)}) for text: {text[:100]}...")
+            return None
     
     def translate_text(self, text: str, target_lang: str) -> Optional[str]:
         """
-        Translate text to target language with caching
+        Translate text to target language through the translation memory
         
         Args:
             text: Text to translate
@@ -63,21 +222,8 @@ class TranslationService:
         """
         if not text or target_lang == 'en':
             return text
-            
-        # Check cache first
-        cache_key = self._get_cache_key(text, target_lang)
-        cached_translation = cache.get(cache_key)
-        if cached_translation:
-            return cached_translation
-            
-        # Perform translation
-        translated_text = self._translate_with_retry(text, target_lang)
-        if translated_text:
-            # Cache successful translation for 24 hours
-            cache.set(cache_key, translated_text, timeout=86400)
-            return translated_text
-            
-        return None
+        
+        return self.translate_batch([text], [target_lang])[0][target_lang]
     
     def translate_html(self, html: str, target_lang: str) -> Optional[str]:
         """
@@ -92,15 +238,124 @@ class TranslationService:
         """
         if not html or target_lang == 'en':
             return html
+        
+        # Only the text between tags is sent; the markup is copied back as-is
+        texts = list(dict.fromkeys(html_text_runs(html)))
+        results = self.translate_batch(texts, [target_lang])
+        return translate_html_runs(
+            html,
+            {text: result[target_lang] for text, result in zip(texts, results)}
+        )
+    
+    def _chunk_texts(self, texts: Sequence[str]) -> List[List[str]]:
+        """Group texts into chunks that fit in a single provider request"""
+        chunks = []
+        current = []
+        current_size = 0
+        separator_size = len(self.BATCH_SEPARATOR)
+        
+        for text in texts:
+            size = len(text) + (separator_size if current else 0)
+            if current and current_size + size > self.MAX_BATCH_CHARS:
+                chunks.append(current)
+                current = []
+                current_size = 0
+                size = len(text)
+            current.append(text)
+            current_size += size
+        
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _translate_chunk(self, texts: List[str], target_lang: str) -> List[Optional[str]]:
+        """Translate a chunk of texts with one request, falling back per text"""
+        if len(texts) == 1:
+            return [self._translate_with_retry(texts[0], target_lang)]
+        
+        joined = self._translate_with_retry(
+            self.BATCH_SEPARATOR.join(texts),
+            target_lang
+        )
+        if not joined:
+            # The provider is failing; retrying each text would only multiply the cost
+            return [None] * len(texts)
+        
+        parts = [part.strip() for part in joined.split(self.BATCH_SPLIT_TOKEN)]
+        if len(parts) == len(texts):
+            return parts
+        logger.warning(
+            f"Batch translation returned {len(parts)} parts for {len(texts)} texts, "
+            f"retrying individually"
+        )
+        return [self._translate_with_retry(text, target_lang) for text in texts]
+    
+    def translate_batch(
+        self,
+        items: Sequence[str],
+        target_langs: Sequence[str]
+    ) -> List[Dict[str, Optional[str]]]:
+        """
+        Translate many texts into many languages with as few requests as possible
+        
+        Texts already in the translation memory are not sent again, duplicates
+        are sent once and the rest are packed into requests of up to
+        MAX_BATCH_CHARS.
+        
+        Args:
+            items: Texts to translate
+            target_langs: Target language codes (e.g., ['hi', 'bn'])
             
-        try:
-            # Simple HTML tag preservation - can be enhanced for more complex HTML
-            translation = self.translate_text(html, target_lang)
-            if translation:
-                # Preserve basic HTML tags from original
-                for tag in ['<p>', '</p>', '<br>', '<strong>', '</strong>', '<em>', '</em>']:
-                    translation = translation.replace(tag.lower(), tag)
-            return translation
-        except Exception as e:
-            logger.error(f"HTML translation failed: {str(e)}")
-            return None 
\ No newline at end of file
+        Returns:
+            One dict per input text, mapping each language code to the
+            translated text or None if translation failed
+        """
+        results = [{} for _ in items]
+        pending_by_lang = {}
+        translations_by_lang = {}
+        requests = []
+        
+        for target_lang in target_langs:
+            pending = {}
+            for index, text in enumerate(items):
+                if not text or target_lang == 'en':
+                    results[index][target_lang] = text
+                else:
+                    pending.setdefault(text, []).append(index)
+            
+            # Known translations come from memory, only the rest goes to the provider
+            translations = self._lookup_memory(list(pending), target_lang)
+            misses = [text for text in pending if text not in translations]
+            requests.extend((target_lang, chunk) for chunk in self._chunk_texts(misses))
+            
+            pending_by_lang[target_lang] = pending
+            translations_by_lang[target_lang] = translations
+        
+        new_translations = {target_lang: {} for target_lang in target_langs}
+        for (target_lang, chunk), translated_chunk in zip(requests, self._run_requests(requests)):
+            for text, translated_text in zip(chunk, translated_chunk):
+                if translated_text:
+                    new_translations[target_lang][text] = translated_text
+        
+        for target_lang, pending in pending_by_lang.items():
+            self._store_memory(new_translations[target_lang], target_lang)
+            translations = translations_by_lang[target_lang]
+            translations.update(new_translations[target_lang])
+            
+            for text, indexes in pending.items():
+                for index in indexes:
+                    results[index][target_lang] = translations.get(text)
+        
+        return results
+    
+    def _run_requests(self, requests: List[tuple]) -> List[List[Optional[str]]]:
+        """Send (language, chunk) requests concurrently, up to TRANSLATION_CONCURRENCY at once"""
+        concurrency = min(getattr(settings, 'TRANSLATION_CONCURRENCY', 4), len(requests))
+        if concurrency <= 1:
+            return [self._translate_chunk(chunk, target_lang) for target_lang, chunk in requests]
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(
+                lambda request: self._translate_chunk(request[1], request[0]),
+                requests
+            ))
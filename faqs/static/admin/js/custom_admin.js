@@ -20,10 +20,8 @@
         });
 
         // Auto-expand translation section if there are errors
-        if ($('.field-question_hi .errors, .field-answer_hi .errors, ' +
-            '.field-question_bn .errors, .field-answer_bn .errors').length) {
-            $('.field-question_hi, .field-answer_hi, ' +
-            '.field-question_bn, .field-answer_bn').closest('.collapse').removeClass('collapsed');
+        if ($('.inline-related .errors').length) {
+            $('.inline-related .errors').closest('.collapse').removeClass('collapsed');
         }
 
         // Add warning when leaving page with unsaved changes
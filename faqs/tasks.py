@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from datetime import timedelta
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from typing import List
+from .models import FAQ, TranslationJob
+from .services import TranslationService
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationWorker:
+    """Drains the TranslationJob queue and writes translations back to FAQs"""
+
+    def __init__(
+        self, concurrency=4, max_retries=5, backoff=2.0, batch_size=50, lease_timeout=300
+    ):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff  # seconds, doubled on every attempt
+        self.batch_size = batch_size
+        self.lease_timeout = lease_timeout  # seconds a claim lasts before others may take it
+
+    def claim(self) -> List[TranslationJob]:
+        """
+        Mark the next batch of due jobs as running and return them
+
+        Running jobs claimed more than lease_timeout seconds ago, by a worker
+        that has presumably died, are claimed again.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            due = TranslationJob.objects.select_for_update(skip_locked=True).filter(
+                Q(status=TranslationJob.STATUS_PENDING, available_at__lte=now)
+                | Q(
+                    status=TranslationJob.STATUS_RUNNING,
+                    updated_at__lte=now - timedelta(seconds=self.lease_timeout)
+                )
+            ).order_by('available_at')[:self.batch_size]
+            job_ids = list(due.values_list('id', flat=True))
+            # updated_at marks the claim; update() does not set auto_now fields
+            TranslationJob.objects.filter(id__in=job_ids).update(
+                status=TranslationJob.STATUS_RUNNING, updated_at=now
+            )
+        return list(TranslationJob.objects.filter(id__in=job_ids))
+
+    def _retry_or_fail(self, jobs, error):
+        """Reschedule jobs with exponential backoff, failing them past max_retries"""
+        now = timezone.now()
+        for job in jobs:
+            job.attempts += 1
+            job.last_error = str(error)[:1000]
+            if job.attempts >= self.max_retries:
+                job.status = TranslationJob.STATUS_FAILED
+                logger.error(f"Giving up on translation job {job}: {error}")
+            else:
+                job.status = TranslationJob.STATUS_PENDING
+                job.available_at = now + timedelta(
+                    seconds=self.backoff * 2 ** (job.attempts - 1)
+                )
+
+        # Only touch jobs that were not re-queued by a newer save in the meantime
+        for job in jobs:
+            TranslationJob.objects.filter(
+                pk=job.pk, status=TranslationJob.STATUS_RUNNING
+            ).update(
+                status=job.status,
+                attempts=job.attempts,
+                last_error=job.last_error,
+                available_at=job.available_at
+            )
+
+    def process_faq(self, faq_id, jobs):
+        """Translate and store all claimed jobs for one FAQ"""
+        try:
+            faq = FAQ.objects.filter(pk=faq_id).first()
+            if faq is None or not faq.auto_translate:
+                TranslationJob.objects.filter(id__in=[job.id for job in jobs]).delete()
+                return
+
+            # Only the claimed (field, language) pairs, grouped by language set
+            languages_by_field = defaultdict(set)
+            for job in jobs:
+                languages_by_field[job.field].add(job.language)
+            fields_by_languages = defaultdict(list)
+            for field, languages in sorted(languages_by_field.items()):
+                fields_by_languages[tuple(sorted(languages))].append(field)
+
+            try:
+                translated = [
+                    result
+                    for languages, fields in fields_by_languages.items()
+                    for result in FAQ.update_translations_bulk([faq], fields, list(languages))
+                ]
+            except Exception as e:
+                self._retry_or_fail(jobs, e)
+                return
+
+            done = {(field, lang) for _, field, lang in translated}
+            if done:
+                with transaction.atomic():
+                    faq.save_translations()
+                    FAQ.objects.filter(pk=faq.pk).update(last_translated=faq.last_translated)
+
+            finished = [job for job in jobs if (job.field, job.language) in done]
+            TranslationJob.objects.filter(
+                id__in=[job.id for job in finished],
+                status=TranslationJob.STATUS_RUNNING
+            ).delete()
+
+            failed = [job for job in jobs if (job.field, job.language) not in done]
+            if failed:
+                self._retry_or_fail(failed, 'Translation provider returned no result')
+        finally:
+            if self.concurrency > 1:
+                connection.close()
+
+    def run_once(self) -> int:
+        """Process one claimed batch; returns the number of jobs handled"""
+        jobs = self.claim()
+        if not jobs:
+            return 0
+
+        jobs_by_faq = defaultdict(list)
+        for job in jobs:
+            jobs_by_faq[job.faq_id].append(job)
+
+        if self.concurrency > 1:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                list(executor.map(lambda item: self.process_faq(*item), jobs_by_faq.items()))
+        else:
+            for faq_id, faq_jobs in jobs_by_faq.items():
+                self.process_faq(faq_id, faq_jobs)
+
+        return len(jobs)
+
+    def run(self, poll_interval=1.0, exit_when_empty=False):
+        """Keep draining the queue, sleeping while it is empty"""
+        while True:
+            handled = self.run_once()
+            if handled:
+                logger.info(f"Processed {handled} translation jobs")
+                continue
+            TranslationService.flush_memory_hits()
+            if exit_when_empty:
+                return
+            time.sleep(poll_interval)
@@ -0,0 +1,402 @@
+import gzip
+import io
+import json
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from redis.exceptions import RedisError
+from rest_framework.test import APIRequestFactory
+
+from faqs.api import FAQViewSet
+from faqs.caching import (
+    GENERATION_KEY, bump_generation, cache_get, cache_set, cached_build, decode_value,
+    encode_value, get_generation, local_cache, page_cache_key
+)
+from faqs.models import FAQ, FAQTranslation
+from faqs.rendering import entry_body, render_entry
+from faqs.serializers import FAQSerializer
+from faqs.tests.utils import make_answer
+
+
+class TestCacheGeneration(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.faq = FAQ.objects.create(
+            question='Question', answer=make_answer('<p>Answer</p>'), auto_translate=False
+        )
+        self.list_view = FAQViewSet.as_view({'get': 'list'})
+        self.factory = APIRequestFactory()
+
+    def get_questions(self, lang='en'):
+        response = self.list_view(self.factory.get('/api/faqs/', {'lang': lang}))
+        return [item['question'] for item in json.loads(response.content)['results']]
+
+    def test_queryset_update_invalidates_list(self):
+        """Test 1: QuerySet.update() is seen by the next cached list"""
+        self.assertEqual(self.get_questions(), ['Question'])
+
+        FAQ.objects.filter(pk=self.faq.pk).update(is_active=False)
+
+        self.assertEqual(self.get_questions(), [])
+
+    def test_creates_and_translations_invalidate_list(self):
+        """Test 2: New FAQs and translation rows retire cached lists"""
+        self.assertEqual(self.get_questions('hi'), ['Question'])
+
+        FAQTranslation.upsert([FAQTranslation(faq=self.faq, lang='hi', question='Prashn')])
+        self.assertEqual(self.get_questions('hi'), ['Prashn'])
+
+        FAQ.objects.create(question='Second', answer=make_answer('<p>Two</p>'), auto_translate=False)
+        self.assertEqual(len(self.get_questions('hi')), 2)
+
+    def test_generation_survives_eviction(self):
+        """Test 3: A lost counter restarts above every earlier generation"""
+        generation = get_generation()
+        cache.delete(GENERATION_KEY)
+
+        bump_generation()
+
+        self.assertGreaterEqual(get_generation(), generation)
+
+
+class TestRenderedResponses(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        for i in range(5):
+            FAQ.objects.create(
+                question=f'Question {i}', answer=make_answer(f'<p>Answer {i}</p>'),
+                auto_translate=False
+            )
+        self.list_view = FAQViewSet.as_view({'get': 'list'})
+        self.by_language_view = FAQViewSet.as_view({'get': 'by_language'})
+        self.factory = APIRequestFactory()
+
+    def test_matching_etag_gets_304_without_queries(self):
+        """Test 4: Polling with the current ETag returns 304 and reads no rows"""
+        first = self.list_view(self.factory.get('/api/faqs/'))
+        self.assertEqual(first.status_code, 200)
+
+        with self.assertNumQueries(0):
+            polled = self.list_view(self.factory.get('/api/faqs/', HTTP_IF_NONE_MATCH=first['ETag']))
+        self.assertEqual(polled.status_code, 304)
+        self.assertEqual(polled['ETag'], first['ETag'])
+
+        FAQ.objects.update(question='Changed')
+        changed = self.list_view(self.factory.get('/api/faqs/', HTTP_IF_NONE_MATCH=first['ETag']))
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+
+    def test_gzip_variant(self):
+        """Test 5: Clients accepting gzip get the pre-compressed body"""
+        plain = self.by_language_view(self.factory.get('/api/faqs/by_language/'))
+        zipped = self.by_language_view(
+            self.factory.get('/api/faqs/by_language/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        )
+
+        self.assertEqual(zipped['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(zipped.content), plain.content)
+        self.assertNotEqual(zipped['ETag'], plain['ETag'])
+        data = json.loads(plain.content)
+        self.assertEqual(set(data), {'en', 'hi', 'bn'})
+        self.assertEqual(len(data['hi']), 5)
+
+    def test_identity_hits_are_not_inflated(self):
+        """Test 6: Only very large bodies are stored gzipped alone"""
+        self.list_view(self.factory.get('/api/faqs/'))
+
+        with mock.patch('faqs.rendering.gzip.decompress') as decompress:
+            plain = self.list_view(self.factory.get('/api/faqs/'))
+        decompress.assert_not_called()
+        self.assertEqual(len(json.loads(plain.content)['results']), 5)
+
+        body = b'[' + b'0,' * 300 + b'0]'
+        self.assertIsNotNone(render_entry(body)['body'])
+        with self.settings(FAQ_CACHE_GZIP_ONLY_MIN_SIZE=500):
+            entry = render_entry(body)
+        self.assertIsNone(entry['body'])
+        self.assertEqual(entry_body(entry), body)
+
+
+class TestPagination(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        for i in range(5):
+            FAQ.objects.create(
+                question=f'Question {i}', answer=make_answer(f'<p>{i}</p>'), auto_translate=False
+            )
+        self.list_view = FAQViewSet.as_view({'get': 'list'})
+        self.factory = APIRequestFactory()
+
+    def get_page(self, url, **params):
+        return json.loads(self.list_view(self.factory.get(url, params)).content)
+
+    def test_cursor_pages_are_cached_separately(self):
+        """Test 7: Pages walk newest first and are each cached once"""
+        with self.assertNumQueries(1):
+            first = self.get_page('/api/faqs/', page_size=2)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_page('/api/faqs/', page_size=2), first)
+
+        questions = [item['question'] for item in first['results']]
+        link = first['next']
+        while link:
+            page = self.get_page(urljoin('/api/faqs/', link))
+            questions.extend(item['question'] for item in page['results'])
+            link = page['next']
+
+        self.assertEqual(questions, [f'Question {i}' for i in reversed(range(5))])
+
+    def test_sparse_fieldsets(self):
+        """Test 8: ?fields= drops answers and is cached apart from full pages"""
+        full = self.get_page('/api/faqs/')
+        sparse = self.get_page('/api/faqs/', fields='question,id')
+
+        self.assertEqual(set(full['results'][0]), {
+            'id', 'question', 'answer', 'created_at', 'updated_at', 'is_active'
+        })
+        self.assertEqual(list(sparse['results'][0]), ['id', 'question'])
+        response = self.list_view(self.factory.get('/api/faqs/', {'fields': 'question,secret'}))
+        self.assertEqual(response.status_code, 400)
+
+    def test_links_do_not_depend_on_the_building_request(self):
+        """Test 9: A cached page carries no host or stray parameter of the request that built it"""
+        poisoned = self.list_view(self.factory.get(
+            '/api/faqs/', {'page_size': 2, 'utm_source': 'evil'}, HTTP_HOST='internal.local'
+        ))
+        served = self.list_view(self.factory.get(
+            '/api/faqs/', {'page_size': 2}, HTTP_HOST='public.example.com'
+        ))
+
+        self.assertEqual(served.content, poisoned.content)
+        link = json.loads(served.content)['next']
+        self.assertTrue(link.startswith('?'))
+        self.assertNotIn('internal.local', link)
+        self.assertNotIn('utm_source', link)
+        self.assertEqual(
+            set(parse_qs(urlsplit(link).query)), {'cursor', 'lang', 'page_size'}
+        )
+        bogus = self.list_view(self.factory.get('/api/faqs/', {'cursor': 'bogus'}))
+        self.assertEqual(bogus.status_code, 404)
+
+    def test_builders_hold_plain_values_only(self):
+        """Test 10: What may be rebuilt in the background holds no request or view"""
+        with mock.patch('faqs.api.cached_build', wraps=cached_build) as spy:
+            self.get_page('/api/faqs/', page_size=2, fields='id,question')
+            FAQViewSet.as_view({'get': 'by_language'})(self.factory.get('/api/faqs/by_language/'))
+
+        for call in spy.call_args_list:
+            build = call.args[1]
+            self.assertNotIsInstance(getattr(build.func, '__self__', None), FAQViewSet)
+            for value in build.args:
+                self.assertIsInstance(value, (str, int, list, type(None)))
+
+    def test_unknown_languages_and_later_pages_leave_no_last_copy(self):
+        """Test 11: Unknown languages are rejected and only first pages keep a last copy"""
+        for lang in ('xx', 'x' * 500):
+            response = self.list_view(self.factory.get('/api/faqs/', {'lang': lang}))
+            self.assertEqual(response.status_code, 400)
+
+        first = self.get_page('/api/faqs/', page_size=2)
+        cursor = parse_qs(urlsplit(first['next']).query)['cursor'][0]
+        self.get_page('/api/faqs/', page_size=2, cursor=cursor)
+
+        self.assertIsNotNone(cache.get(f"{page_cache_key('en', None, 2)}:last"))
+        self.assertIsNone(cache.get(f"{page_cache_key('en', cursor, 2)}:last"))
+
+
+class TestBatchedCacheReads(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(5):
+            faq = FAQ.objects.create(
+                question=f'Question {i}', answer=make_answer(f'<p>{i}</p>'), auto_translate=False
+            )
+            FAQTranslation.objects.create(faq=faq, lang='hi', question=f'Prashn {i}')
+
+    def serialize(self):
+        faqs = FAQ.objects.with_language('hi')
+        return FAQSerializer(faqs, many=True, context={'language': 'hi'}).data
+
+    def test_list_uses_one_cache_read(self):
+        """Test 12: Cold and warm lists cost one get_many, not one get per field"""
+        with mock.patch('faqs.caching.cache', mock.Mock(wraps=cache)) as spy:
+            cold = self.serialize()
+            warm = self.serialize()
+
+        self.assertEqual(cold, warm)
+        self.assertEqual(spy.get_many.call_count, 1)  # warm reads stay in-process
+        self.assertEqual(spy.set_many.call_count, 1)
+        self.assertFalse([call for call in spy.get.call_args_list if call.args[0] != GENERATION_KEY])
+        self.assertEqual(
+            [item['question'] for item in warm], [f'Prashn {i}' for i in reversed(range(5))]
+        )
+
+
+class TestLocalTier(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+
+    @override_settings(FAQ_LOCAL_CACHE_SIZE=2)
+    def test_size_bounded_lru(self):
+        """Test 13: The least recently used entry is evicted first"""
+        cache_set('a', 1)
+        cache_set('b', 2)
+        self.assertEqual(cache_get('a'), 1)
+        cache_set('c', 3)
+
+        self.assertEqual(local_cache.get_many(['a', 'b', 'c'], get_generation()), {'a': 1, 'c': 3})
+
+    @override_settings(FAQ_GENERATION_CHECK_INTERVAL=0)
+    def test_other_worker_bump_is_seen(self):
+        """Test 14: A generation bumped elsewhere retires this process's entries"""
+        cache_set('faq_list:en', ['old'])
+        cache.incr(GENERATION_KEY)  # as another worker would
+
+        self.assertIsNone(cache_get('faq_list:en'))
+
+    def test_serves_local_copy_when_redis_is_down(self):
+        """Test 15: Warm entries keep being served while Redis fails"""
+        cache_set('faq_list:en', ['cached'])
+
+        with mock.patch.object(cache, 'get_many', side_effect=RedisError('down')), \
+                mock.patch.object(cache, 'get', side_effect=RedisError('down')):
+            local_cache.checked_at = float('-inf')
+            self.assertEqual(cache_get('faq_list:en'), ['cached'])
+            self.assertIsNone(cache_get('faq_list:hi'))
+
+
+class TestSingleFlight(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+
+    def test_concurrent_misses_build_once(self):
+        """Test 16: Requests missing together trigger a single rebuild"""
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.2)
+            return ['built']
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(lambda _: cached_build('faq_list:en', build), range(5)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [['built']] * 5)
+
+    def test_waiters_get_previous_value_after_invalidation(self):
+        """Test 17: While another worker rebuilds, the last list is served"""
+        cached_build('faq_list:en', lambda: ['old'])
+        bump_generation()
+        cache.add(f'lock:faq_list:en:{get_generation()}', 1)  # another worker is rebuilding
+
+        self.assertEqual(cached_build('faq_list:en', lambda: ['new']), ['old'])
+
+    @override_settings(FAQ_CACHE_SOFT_TTL=0)
+    def test_soft_expired_entry_refreshes_in_background(self):
+        """Test 18: A soft-expired entry is served while it is rebuilt"""
+        cached_build('faq_list:en', lambda: ['old'])
+
+        self.assertEqual(cached_build('faq_list:en', lambda: ['new']), ['old'])
+
+        deadline = time.monotonic() + 2
+        while cache_get('faq_list:en')['value'] != ['new'] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(cache_get('faq_list:en')['value'], ['new'])
+
+
+warm_calls = []
+
+
+def record_warm():
+    warm_calls.append(1)
+
+
+class TestWarming(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.faq = FAQ.objects.create(
+            question='Question', answer=make_answer('<p>Answer</p>'), auto_translate=False
+        )
+        FAQTranslation.objects.create(faq=self.faq, lang='hi', question='Prashn')
+
+    def test_warmed_views_read_no_rows(self):
+        """Test 19: After warm_faq_cache, lists and first pages are served from the cache"""
+        call_command('warm_faq_cache', stdout=io.StringIO())
+        by_language_view = FAQViewSet.as_view({'get': 'by_language'})
+        list_view = FAQViewSet.as_view({'get': 'list'})
+
+        with self.assertNumQueries(0):
+            response = by_language_view(APIRequestFactory().get('/api/faqs/by_language/'))
+            question = self.faq.get_translated_text('question', 'hi')
+            pages = {
+                lang: json.loads(list_view(APIRequestFactory().get('/api/faqs/', {
+                    'lang': lang
+                })).content)
+                for lang in ('en', 'hi', 'bn')
+            }
+
+        self.assertEqual(question, 'Prashn')
+        self.assertEqual(pages['hi']['results'][0]['question'], 'Prashn')
+        self.assertEqual(pages['en']['results'][0]['question'], 'Question')
+        self.assertEqual(json.loads(response.content)['hi'][0]['question'], 'Prashn')
+        self.assertEqual(json.loads(response.content)['bn'][0]['question'], 'Question')
+
+    @override_settings(FAQ_CACHE_WARMER='faqs.tests.test_caching.record_warm')
+    def test_writes_schedule_the_warmer(self):
+        """Test 20: A committed write warms the cache in the background"""
+        warm_calls.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            FAQ.objects.filter(pk=self.faq.pk).update(question='Changed')
+
+        deadline = time.monotonic() + 2
+        while not warm_calls and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(warm_calls, [1])
+
+
+class TestCodec(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+
+    def test_large_values_are_compressed(self):
+        """Test 21: Values past the threshold shrink and decode to the same value"""
+        small = {'question': 'Short'}
+        large = [f'<p>Answer {i}, much like the others.</p>' for i in range(200)]
+
+        self.assertEqual(encode_value(small)[:1], b'p')
+        self.assertIn(encode_value(large)[:1], (b'z', b's'))
+        self.assertLess(len(encode_value(large)), len(pickle.dumps(large)) // 10)
+        self.assertEqual(decode_value(encode_value(large)), large)
+
+        cache.set_many({'faq_list:en': b'garbage'}, version=get_generation())
+        self.assertIsNone(cache_get('faq_list:en'))
+
+    def test_by_language_is_not_stored_twice(self):
+        """Test 22: by_language is joined from the per-language entries, not copied"""
+        FAQ.objects.create(question='Question', answer=make_answer('<p>A</p>'), auto_translate=False)
+        view = FAQViewSet.as_view({'get': 'by_language'})
+
+        with mock.patch('faqs.caching.cache', mock.Mock(wraps=cache)) as spy:
+            first = view(APIRequestFactory().get('/api/faqs/by_language/'))
+            second = view(APIRequestFactory().get('/api/faqs/by_language/'))
+
+        written = [key for call in spy.set_many.call_args_list for key in call.args[0]]
+        self.assertEqual(
+            sorted(written),
+            sorted(f'faq_list:{lang}{end}' for lang in ('en', 'hi', 'bn') for end in ('', ':last'))
+        )
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(json.loads(first.content)['hi'][0]['question'], 'Question')
@@ -0,0 +1,145 @@
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from faqs.models import FAQ, FAQTranslation, TranslationJob
+from faqs.serializers import FAQListSerializer, FAQSerializer
+from faqs.tests.utils import MockBackendTestCase, make_answer
+
+
+@override_settings(TRANSLATION_ASYNC=False, TRANSLATION_BACKEND='faqs.backends.LocalBackend')
+class TestFAQTranslation(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(3):
+            FAQ.objects.create(question=f'Question {i}', answer=make_answer(f'<p>Answer {i}</p>'))
+
+    def test_translations_stored_per_language(self):
+        """Test 1: Each target language gets its own row"""
+        faq = FAQ.objects.first()
+
+        self.assertEqual(
+            sorted(faq.translations.values_list('lang', flat=True)), ['bn', 'hi']
+        )
+        self.assertEqual(faq.get_translation('hi').question, f'hi:{faq.question}')
+        self.assertEqual(faq.get_translation('hi').source_hash, faq.get_source_hash())
+
+    def test_with_language_loads_one_language(self):
+        """Test 2: Listing in one language costs two queries in total"""
+        with self.assertNumQueries(2):
+            faqs = list(FAQ.objects.with_language('bn'))
+            questions = [faq.get_translation('bn').question for faq in faqs]
+
+        self.assertTrue(all(question.startswith('bn:') for question in questions))
+        self.assertFalse(hasattr(faqs[0], '_prefetched_translations_hi'))
+
+    def test_translated_text_falls_back_to_english(self):
+        """Test 3: Missing translations fall back to the English content"""
+        faq = FAQ.objects.first()
+        faq.auto_translate = False
+        FAQ.objects.filter(pk=faq.pk).update(auto_translate=False)
+        FAQTranslation.objects.filter(faq=faq, lang='hi').delete()
+        faq.refresh_from_db()
+
+        self.assertEqual(faq.get_translated_text('question', 'hi'), faq.question)
+
+    def test_rendered_answer_is_stored(self):
+        """Test 4: Saving renders sanitized answer HTML for every language"""
+        faq = FAQ.objects.create(
+            question='Question', answer=make_answer('<p onclick="x()">Hi<script>1</script></p>')
+        )
+
+        self.assertEqual(faq.answer_html, '<p>Hi</p>')
+        self.assertEqual(faq.get_translation('hi').answer_html, '<p>hi:Hi</p>')
+
+
+@override_settings(TRANSLATION_ASYNC=False)
+class TestChangeTracking(MockBackendTestCase):
+    def setUp(self):
+        super().setUp()
+
+        created = FAQ.objects.create(question='Old question', answer=make_answer('<p>Answer</p>'))
+        self.faq = FAQ.objects.get(pk=created.pk)
+        self.backend.translate.reset_mock()
+
+    def test_flag_changes_do_not_translate(self):
+        """Test 5: Saving only is_active or auto_translate makes no provider calls"""
+        self.faq.is_active = False
+        self.faq.save()
+        self.faq.auto_translate = False
+        self.faq.save(update_fields=['auto_translate'])
+
+        self.backend.translate.assert_not_called()
+        self.assertEqual(self.faq.get_changed_source_fields(), [])
+
+    def test_only_changed_field_is_translated_once(self):
+        """Test 6: Editing the question retranslates the question alone, once"""
+        self.faq.question = 'New question'
+        self.faq.save()
+
+        sent = [call.args[0] for call in self.backend.translate.call_args_list]
+        self.assertEqual(sent, ['New question', 'New question'])
+        self.assertEqual(self.faq.get_translation('hi').question, 'hi:New question')
+
+        self.faq.save()
+        self.assertEqual(self.backend.translate.call_count, 2)
+
+    def test_changes_detected_without_query(self):
+        """Test 7: Change detection reads no rows"""
+        self.faq.question = 'New question'
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.faq.get_changed_source_fields(), ['question'])
+
+    @override_settings(TRANSLATION_ASYNC=True)
+    def test_async_save_queues_changed_fields_only(self):
+        """Test 8: Background mode queues jobs for the changed field alone"""
+        self.faq.answer = make_answer('<p>New answer</p>')
+        self.faq.save()
+
+        self.assertEqual(
+            set(TranslationJob.objects.values_list('field', flat=True)), {'answer'}
+        )
+
+
+@override_settings(TRANSLATION_ASYNC=False, TRANSLATION_BACKEND='faqs.backends.LocalBackend')
+class TestForLanguage(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.translated = FAQ.objects.create(
+            question='Translated', answer=make_answer('<p>Answer</p>')
+        )
+        self.untranslated = FAQ.objects.create(
+            question='Untranslated', answer=make_answer('<p>English only</p>'),
+            auto_translate=False
+        )
+
+    def test_rows_use_translation_or_english(self):
+        """Test 9: Missing or empty translations fall back to English in SQL"""
+        FAQTranslation.objects.create(faq=self.untranslated, lang='hi', question='')
+
+        with self.assertNumQueries(1):
+            rows = {row['id']: row for row in FAQ.objects.for_language('hi')}
+
+        self.assertEqual(rows[self.translated.pk]['translated_question'], 'hi:Translated')
+        self.assertEqual(rows[self.translated.pk]['translated_answer'], '<p>hi:Answer</p>')
+        self.assertEqual(rows[self.untranslated.pk]['translated_question'], 'Untranslated')
+        self.assertEqual(rows[self.untranslated.pk]['translated_answer'], '<p>English only</p>')
+
+    def test_english_rows(self):
+        """Test 10: English rows carry the answer HTML, not the stored JSON"""
+        row = FAQ.objects.for_language('en').get(pk=self.translated.pk)
+
+        self.assertEqual(row['translated_question'], 'Translated')
+        self.assertEqual(row['translated_answer'], '<p>Answer</p>')
+
+    def test_row_serializer_matches_faq_serializer(self):
+        """Test 11: The fast list serializer gives the same JSON as FAQSerializer"""
+        for lang in ('en', 'hi'):
+            rows = FAQ.objects.filter(is_active=True).for_language(lang)
+            faqs = FAQ.objects.filter(is_active=True).with_language(lang)
+
+            self.assertEqual(
+                FAQListSerializer(rows, many=True).data,
+                FAQSerializer(faqs, many=True, context={'language': lang}).data
+            )
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from faqs.backends import get_backend
+from faqs.resilience import (
+    CircuitBreaker, Deadline, ProviderUnavailable, ResilientProvider, TokenBucket
+)
+
+
+class TestResilientProvider(SimpleTestCase):
+    def test_token_bucket_limits_bursts(self):
+        """Test 1: The bucket hands out at most `capacity` tokens at once"""
+        bucket = TokenBucket(rate=0.001, capacity=2)
+
+        self.assertTrue(bucket.acquire(timeout=0))
+        self.assertTrue(bucket.acquire(timeout=0))
+        self.assertFalse(bucket.acquire(timeout=0))
+
+    def test_breaker_opens_and_recovers(self):
+        """Test 2: The circuit opens after repeated failures and closes after a good trial"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+        breaker._opened_at -= 60
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_open_circuit_fails_fast(self):
+        """Test 3: No provider call is made while the circuit is open"""
+        provider = ResilientProvider(max_retries=2, failure_threshold=2)
+        failing = mock.Mock(side_effect=Exception('down'))
+
+        with mock.patch('faqs.resilience.time.sleep'):
+            with self.assertRaises(ProviderUnavailable):
+                provider.call(failing)
+        with self.assertRaises(ProviderUnavailable):
+            provider.call(failing)
+
+        self.assertEqual(failing.call_count, 2)
+        self.assertEqual(provider.state()['circuit'], CircuitBreaker.OPEN)
+        self.assertEqual(provider.state()['failure_rate'], 1.0)
+
+    def test_expired_deadline_stops_retries(self):
+        """Test 4: A spent request budget refuses further attempts"""
+        provider = ResilientProvider()
+        func = mock.Mock(return_value='ok')
+
+        with self.assertRaises(ProviderUnavailable):
+            provider.call(func, deadline=Deadline(0))
+        func.assert_not_called()
+
+    def test_refused_trial_frees_the_half_open_slot(self):
+        """Test 5: A half-open trial refused before reaching the provider does not wedge the circuit"""
+        provider = ResilientProvider(rate=0.001, burst=1, max_retries=1, failure_threshold=1)
+        with self.assertRaises(ProviderUnavailable):
+            provider.call(mock.Mock(side_effect=Exception('down')))
+        provider.breaker._opened_at -= 60
+
+        with self.assertRaises(ProviderUnavailable):
+            provider.call(mock.Mock(), deadline=Deadline(0))
+        with self.assertRaises(ProviderUnavailable):
+            provider.call(mock.Mock(), deadline=Deadline(0.01))  # no token left
+        provider.limiter._tokens = 1
+
+        self.assertEqual(provider.call(mock.Mock(return_value='ok')), 'ok')
+        self.assertEqual(provider.state()['circuit'], CircuitBreaker.CLOSED)
+
+
+class TestBackends(SimpleTestCase):
+    @override_settings(
+        TRANSLATION_BACKEND='faqs.backends.LocalBackend',
+        TRANSLATION_BACKEND_OPTIONS={'failure_rate': 0.0}
+    )
+    def test_local_backend_is_shared_and_deterministic(self):
+        """Test 1: One backend instance per process with repeatable output"""
+        backend = get_backend()
+
+        self.assertIs(get_backend(), backend)
+        self.assertEqual(backend.translate('Hello, world [[#]]', 'hi'), 'hi:Hello, hi:world [[#]]')
+
+    @override_settings(
+        TRANSLATION_BACKEND='faqs.backends.LocalBackend',
+        TRANSLATION_BACKEND_OPTIONS={'failure_rate': 1.0}
+    )
+    def test_local_backend_injects_failures(self):
+        """Test 2: Failure injection makes calls raise"""
+        with self.assertRaises(ConnectionError):
+            get_backend().translate('Hello', 'bn')
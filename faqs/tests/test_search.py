@@ -0,0 +1,98 @@
+from unittest import mock, skipUnless
+
+from django.contrib.admin.sites import site
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from rest_framework.test import APIRequestFactory
+
+from faqs.api import FAQViewSet
+from faqs.models import FAQ, FAQSearchDocument, FAQTranslation
+from faqs.tests.utils import make_answer
+
+
+class TestSearch(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.password = FAQ.objects.create(
+            question='How do I reset my password?',
+            answer=make_answer('<p>Use the <b>reset</b> link; reset it by email.</p>'),
+            auto_translate=False
+        )
+        self.billing = FAQ.objects.create(
+            question='Where is my invoice?',
+            answer=make_answer('<p>Invoices are under billing. You can reset the filters.</p>'),
+            auto_translate=False
+        )
+        FAQTranslation.objects.create(
+            faq=self.password, lang='hi', question='मैं अपना पासवर्ड कैसे बदलूं?'
+        )
+        self.search_view = FAQViewSet.as_view({'get': 'search'})
+
+    def search(self, **params):
+        response = self.search_view(APIRequestFactory().get('/api/faqs/search/', params))
+        return response.status_code, response.data
+
+    def test_ranked_results_per_language(self):
+        """Test 1: Results are ranked and use the requested language"""
+        status, data = self.search(q='reset', fields='id,question')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(
+            [item['id'] for item in data['results']], [self.password.pk, self.billing.pk]
+        )
+
+        _, data = self.search(q='पासवर्ड', lang='hi')
+        self.assertEqual(
+            [item['question'] for item in data['results']], ['मैं अपना पासवर्ड कैसे बदलूं?']
+        )
+        _, data = self.search(q='invoice', lang='hi')
+        self.assertEqual([item['id'] for item in data['results']], [self.billing.pk])
+        self.assertEqual(self.search(q=' ')[0], 400)
+
+    def test_index_follows_writes(self):
+        """Test 2: Saves, updates and deletes keep the index current"""
+        FAQ.objects.filter(pk=self.billing.pk).update(question='Where is my receipt?')
+        self.assertEqual(self.search(q='receipt')[1]['count'], 1)
+
+        FAQ.objects.filter(pk=self.billing.pk).update(is_active=False)
+        self.assertEqual(self.search(q='receipt')[1]['count'], 0)
+
+        FAQTranslation.objects.filter(faq=self.password, lang='hi').delete()
+        self.assertEqual(self.search(q='पासवर्ड', lang='hi')[1]['count'], 0)
+        self.assertEqual(self.search(q='password', lang='hi')[1]['count'], 1)
+
+        self.password.delete()
+        self.assertFalse(FAQSearchDocument.objects.filter(faq_id=self.password.pk).exists())
+
+    def test_admin_search_uses_index(self):
+        """Test 3: The admin changelist search matches any language"""
+        model_admin = site._registry[FAQ]
+        request = RequestFactory().get('/admin/faqs/faq/')
+
+        queryset, _ = model_admin.get_search_results(request, FAQ.objects.all(), 'पासवर्ड')
+
+        self.assertEqual(list(queryset), [self.password])
+
+    def test_fallback_without_index(self):
+        """Test 4: Databases without a full-text index match substrings"""
+        databases = {'default': mock.Mock(vendor='mysql')}
+        with mock.patch('faqs.models.connections', databases):
+            matches = FAQSearchDocument.objects.search('RESET link', 'en')
+            faq_ids = list(matches.values_list('faq_id', flat=True))
+
+        self.assertEqual(faq_ids, [self.password.pk])
+
+    @skipUnless(connection.vendor == 'postgresql', 'PostgreSQL full-text search')
+    def test_postgres_matches_through_gin_indexes(self):
+        """Test 5: PostgreSQL stems English, ranks and reads the GIN indexes"""
+        matches = FAQSearchDocument.objects.search('resetting passwords', 'en')
+        self.assertEqual(list(matches.values_list('faq_id', flat=True)), [self.password.pk])
+        self.assertGreater(matches.first().rank, 0)
+
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        for language in ('en', 'hi', None):
+            plan = FAQSearchDocument.objects.search('reset', language).explain()
+            self.assertIn('faqs_search_', plan)
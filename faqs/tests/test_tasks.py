@@ -0,0 +1,92 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from faqs.models import FAQ, TranslationJob
+from faqs.tasks import TranslationWorker
+from faqs.tests.utils import MockBackendTestCase, make_answer
+
+
+class TestTranslationQueue(MockBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend.translate.side_effect = lambda text, target_lang: text.replace(
+            'How', f'({target_lang}) How'
+        )
+        self.faq = FAQ.objects.create(question='How?', answer=make_answer('<p>Like this</p>'))
+
+    def test_save_enqueues_without_translating(self):
+        """Test 1: Saving records jobs instead of calling the provider"""
+        self.backend.translate.assert_not_called()
+        self.assertEqual(TranslationJob.objects.filter(faq=self.faq).count(), 4)
+
+    def test_jobs_are_deduplicated(self):
+        """Test 2: Repeated saves reuse the existing jobs"""
+        self.faq.question = 'How exactly?'
+        self.faq.save()
+        self.faq.save()
+
+        self.assertEqual(TranslationJob.objects.filter(faq=self.faq).count(), 4)
+
+    def test_worker_writes_translations(self):
+        """Test 3: The worker stores results and clears the queue"""
+        handled = TranslationWorker(concurrency=1).run_once()
+
+        self.faq.refresh_from_db()
+        self.assertEqual(handled, 4)
+        self.assertTrue(self.faq.get_translation('hi').question.startswith('(hi)'))
+        self.assertIsNotNone(self.faq.last_translated)
+        self.assertFalse(TranslationJob.objects.exists())
+
+    def test_failed_jobs_are_rescheduled(self):
+        """Test 4: Provider failures back off and eventually fail"""
+        self.backend.translate.side_effect = Exception('provider down')
+        worker = TranslationWorker(concurrency=1, max_retries=1)
+
+        with mock.patch('faqs.resilience.time.sleep'):
+            worker.run_once()
+
+        statuses = set(TranslationJob.objects.values_list('status', flat=True))
+        self.assertEqual(statuses, {TranslationJob.STATUS_FAILED})
+
+    def test_worker_translates_claimed_pairs_only(self):
+        """Test 5: Jobs for different fields and languages are not crossed"""
+        TranslationJob.objects.all().delete()
+        TranslationJob.enqueue([self.faq], ['question'], ['hi'])
+        TranslationJob.enqueue([self.faq], ['answer'], ['bn'])
+
+        TranslationWorker(concurrency=1).run_once()
+
+        self.faq.refresh_from_db()
+        self.assertTrue(self.faq.get_translation('hi').question.startswith('(hi)'))
+        self.assertFalse(self.faq.get_translation('hi').answer_html)
+        self.assertFalse(self.faq.get_translation('bn').question)
+        self.assertTrue(self.faq.get_translation('bn').answer_html)
+
+    def test_reads_do_not_queue(self):
+        """Test 6: Reading an untranslated field neither translates nor touches jobs"""
+        TranslationJob.objects.filter(faq=self.faq).update(
+            status=TranslationJob.STATUS_FAILED, attempts=5
+        )
+
+        self.assertEqual(self.faq.get_translated_text('question', 'hi'), 'How?')
+
+        self.backend.translate.assert_not_called()
+        self.assertEqual(
+            set(TranslationJob.objects.values_list('status', 'attempts')),
+            {(TranslationJob.STATUS_FAILED, 5)}
+        )
+
+    def test_stranded_jobs_are_reclaimed(self):
+        """Test 7: Running jobs whose claim has expired are picked up again"""
+        worker = TranslationWorker(concurrency=1, lease_timeout=60)
+        self.assertEqual(len(worker.claim()), 4)
+        self.assertEqual(worker.claim(), [])  # still leased to the first claim
+
+        TranslationJob.objects.update(updated_at=timezone.now() - timedelta(seconds=61))
+        handled = worker.run_once()
+
+        self.assertEqual(handled, 4)
+        self.assertFalse(TranslationJob.objects.exists())
+        self.assertTrue(self.faq.get_translation('hi').question.startswith('(hi)'))
@@ -0,0 +1,216 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from unittest import mock
+
+from faqs import caching
+from faqs.api import FAQViewSet
+from faqs.models import FAQ, FAQTranslation, TranslationJob
+from faqs.tests.utils import make_answer
+from faqs.transfer import (
+    FAQImporter, RecordError, export_records, read_records, write_records
+)
+
+
+@override_settings(TRANSLATION_BACKEND='faqs.backends.LocalBackend')
+class TestImportExport(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_import_queues_translation_once(self):
+        """Test 1: Imported FAQs are bulk-created and queued, not translated inline"""
+        records = [
+            {'question': f'Question {i}', 'answer': f'<p>Answer {i}</p>'} for i in range(5)
+        ]
+
+        # Insert, index (two reads and one write) and queue, per chunk
+        with self.assertNumQueries(7):
+            importer = FAQImporter(chunk_size=10).run(records)
+
+        self.assertEqual(importer.created, 5)
+        self.assertEqual(TranslationJob.objects.count(), 5 * 2 * 2)
+        self.assertFalse(FAQTranslation.objects.exists())
+        faq = FAQ.objects.get(question='Question 3')
+        self.assertEqual(faq.answer_html, '<p>Answer 3</p>')
+        self.assertEqual(faq.answer.html, '<p>Answer 3</p>')
+
+    @override_settings(TRANSLATION_ASYNC=False)
+    def test_round_trip_keeps_translations(self):
+        """Test 2: Exported JSONL and CSV import back without new translation work"""
+        faq = FAQ.objects.create(question='Question', answer=make_answer('<p>Answer</p>'))
+
+        for fmt in ('jsonl', 'csv'):
+            stream = io.StringIO()
+            write_records(stream, export_records(FAQ.objects.all()), fmt)
+            stream.seek(0)
+
+            FAQTranslation.objects.all().delete()
+            importer = FAQImporter().run(read_records(stream, fmt))
+
+            self.assertEqual((importer.created, importer.updated, importer.queued), (0, 1, 0))
+            faq.refresh_from_db()
+            self.assertEqual(faq.get_translation('hi').question, 'hi:Question')
+            self.assertEqual(faq.get_translation('bn').answer_html, '<p>bn:Answer</p>')
+
+    def test_changed_fields_only_are_queued(self):
+        """Test 3: Updating an FAQ queues jobs for the fields that changed"""
+        faq = FAQ.objects.create(question='Question', answer=make_answer('<p>Answer</p>'))
+        TranslationJob.objects.all().delete()
+
+        FAQImporter().run([{'id': faq.pk, 'question': 'Question', 'answer': '<p>New</p>'}])
+
+        self.assertEqual(set(TranslationJob.objects.values_list('field', flat=True)), {'answer'})
+        self.assertEqual(FAQ.objects.get(pk=faq.pk).answer_html, '<p>New</p>')
+
+    def test_commands(self):
+        """Test 4: export_faqs output can be fed to import_faqs"""
+        FAQ.objects.create(question='Question', answer=make_answer('<p>Answer</p>'))
+        handle = tempfile.NamedTemporaryFile(suffix='.csv', delete=False)
+        handle.close()
+        self.addCleanup(os.unlink, handle.name)
+
+        call_command('export_faqs', '--output', handle.name, stdout=io.StringIO())
+        FAQ.objects.all().delete()
+        call_command(
+            'import_faqs', handle.name, '--translate-now', '--concurrency', '1',
+            stdout=io.StringIO()
+        )
+
+        faq = FAQ.objects.get()
+        self.assertEqual(faq.question, 'Question')
+        self.assertEqual(faq.get_translation('hi').question, 'hi:Question')
+        self.assertFalse(TranslationJob.objects.exists())
+
+    def test_conflicting_records_are_reported(self):
+        """Test 5: Repeated keys or ids and taken keys fail with the record number"""
+        taken = FAQ.objects.create(question='Taken', answer=make_answer('<p>A</p>'),
+                                   external_key='kb-1')
+        other = FAQ.objects.create(question='Other', answer=make_answer('<p>B</p>'))
+        handle = tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False)
+        with handle:
+            for i, key in enumerate(['kb-2', 'kb-3', 'kb-2']):
+                handle.write(json.dumps({'external_key': key, 'question': f'Q{i}'}) + '\n')
+        self.addCleanup(os.unlink, handle.name)
+
+        with self.assertRaisesMessage(CommandError, "Record 3: external_key 'kb-2' appears"):
+            call_command('import_faqs', handle.name, stdout=io.StringIO())
+        with self.assertRaisesMessage(RecordError, f"Record 2: FAQ {taken.pk} appears"):
+            FAQImporter().run([
+                {'id': taken.pk, 'question': 'Q'}, {'external_key': 'kb-1', 'question': 'Q'}
+            ])
+        with self.assertRaisesMessage(RecordError, "Record 1: external_key 'kb-1' belongs"):
+            FAQImporter().run([{'id': other.pk, 'external_key': 'kb-1', 'question': 'Q'}])
+
+        self.assertEqual(FAQ.objects.count(), 2)
+        self.assertIsNone(FAQ.objects.get(pk=other.pk).external_key)
+
+
+@override_settings(TRANSLATION_BACKEND='faqs.backends.LocalBackend')
+class TestBulkEndpoint(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = get_user_model().objects.create_superuser('admin', password='password')
+        self.bulk_view = FAQViewSet.as_view({'post': 'bulk'})
+
+    def post(self, items, user=None):
+        request = APIRequestFactory().post('/api/faqs/bulk/', items, format='json')
+        force_authenticate(request, user=user or self.admin)
+        return self.bulk_view(request)
+
+    def test_upsert_by_id_and_external_key(self):
+        """Test 6: Items update FAQs matched by id or external key and create the rest"""
+        by_id = FAQ.objects.create(question='By id', answer=make_answer('<p>Old</p>'))
+        by_key = FAQ.objects.create(
+            question='By key', answer=make_answer('<p>Old</p>'), external_key='kb-1'
+        )
+        TranslationJob.objects.all().delete()
+        items = [
+            {'id': by_id.pk, 'question': 'By id', 'answer': '<p>New</p>'},
+            {'external_key': 'kb-1', 'question': 'By key, renamed', 'answer': '<p>Old</p>'},
+        ] + [
+            {'external_key': f'kb-new-{i}', 'question': f'New {i}', 'answer': '<p>Answer</p>',
+             'translations': [{'lang': 'hi', 'question': f'hi:New {i}'}]}
+            for i in range(3)
+        ]
+
+        with mock.patch.object(caching, 'bump_generation', wraps=caching.bump_generation) as bump:
+            response = self.post(items)
+
+        self.assertEqual(response.status_code, 200)
+        # One changed field in two languages per update, two fields in the language not supplied
+        self.assertEqual(response.data, {'created': 3, 'updated': 2, 'queued': 2 + 2 + 3 * 2})
+        self.assertEqual(bump.call_count, 1)
+        self.assertEqual(FAQ.objects.get(pk=by_id.pk).answer_html, '<p>New</p>')
+        self.assertEqual(FAQ.objects.get(pk=by_key.pk).question, 'By key, renamed')
+        faq = FAQ.objects.get(external_key='kb-new-2')
+        self.assertEqual(faq.get_translation('hi').question, 'hi:New 2')
+
+    def test_invalid_payloads_write_nothing(self):
+        """Test 7: One bad item, a repeated key or a non-admin user rejects the whole batch"""
+        FAQ.objects.create(question='Taken', answer=make_answer('<p>A</p>'), external_key='kb-1')
+        valid = {'question': 'Question', 'answer': '<p>Answer</p>'}
+
+        self.assertEqual(self.post([valid, {'answer': '<p>No question</p>'}]).status_code, 400)
+        self.assertEqual(self.post([
+            {**valid, 'external_key': 'kb-2'}, {**valid, 'external_key': 'kb-2'}
+        ]).status_code, 400)
+        taken = FAQ.objects.create(question='Other', answer=make_answer('<p>B</p>'))
+        self.assertEqual(
+            self.post([valid, {**valid, 'id': taken.pk, 'external_key': 'kb-1'}]).status_code,
+            400
+        )
+        user = get_user_model().objects.create_user('user', password='password')
+        self.assertEqual(self.post([valid], user=user).status_code, 403)
+
+        self.assertEqual(FAQ.objects.count(), 2)
+
+
+@override_settings(TRANSLATION_BACKEND='faqs.backends.LocalBackend', FAQ_EXPORT_CHUNK_SIZE=2)
+class TestExportEndpoint(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.export_view = FAQViewSet.as_view({'get': 'export'})
+
+    def export(self, **headers):
+        response = self.export_view(APIRequestFactory().get('/api/faqs/export/', **headers))
+        body = b''.join(response.streaming_content)
+        if response.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return response, [json.loads(line) for line in body.splitlines()]
+
+    def test_streams_every_language(self):
+        """Test 8: Each active FAQ is one line with the text served in every language"""
+        faqs = [
+            FAQ.objects.create(
+                question=f'Question {i}', answer=make_answer(f'<p>Answer {i}</p>'),
+                auto_translate=False
+            )
+            for i in range(5)
+        ]
+        FAQ.objects.filter(pk=faqs[4].pk).update(is_active=False)
+        FAQTranslation.objects.create(faq=faqs[1], lang='hi', question='hi:Question 1')
+
+        # The rows are streamed from one query, plus translations per chunk of two
+        with self.assertNumQueries(3):
+            response, lines = self.export()
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([line['id'] for line in lines], [faq.pk for faq in faqs[:4]])
+        self.assertEqual(lines[1]['languages']['hi'], {
+            'question': 'hi:Question 1', 'answer': '<p>Answer 1</p>'
+        })
+        self.assertEqual(lines[1]['languages']['bn']['question'], 'Question 1')
+        self.assertEqual(set(lines[0]), {'id', 'created_at', 'updated_at', 'languages'})
+
+        response, gzipped = self.export(HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzipped, lines)
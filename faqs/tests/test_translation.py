@@ -0,0 +1,236 @@
+import json
+import threading
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from faqs.models import FAQ, FAQTranslation, TranslationMemory
+from faqs.richtext import sanitize_html, split_blocks
+from faqs.services import TranslationService
+from faqs.tests.utils import MockBackendTestCase
+
+
+def fake_translate(text, target_lang):
+    """Pretend translation: tag every line with the target language"""
+    return text.replace('text', f'{target_lang}-text')
+
+
+class TestTranslateBatch(MockBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend.translate.side_effect = fake_translate
+        self.service = TranslationService()
+
+    def test_results_aligned_with_inputs(self):
+        """Test 1: One result dict per input, keyed by language"""
+        results = self.service.translate_batch(['text one', 'text two'], ['hi', 'bn'])
+
+        self.assertEqual(results, [
+            {'hi': 'hi-text one', 'bn': 'bn-text one'},
+            {'hi': 'hi-text two', 'bn': 'bn-text two'},
+        ])
+
+    def test_one_request_per_language(self):
+        """Test 2: Texts for a language share a single provider request"""
+        self.service.translate_batch(['text a', 'text b', 'text c'], ['hi', 'bn'])
+
+        self.assertEqual(self.backend.translate.call_count, 2)
+
+    def test_chunks_respect_size_limit(self):
+        """Test 3: Payloads above MAX_BATCH_CHARS are split into several requests"""
+        self.service.MAX_BATCH_CHARS = 20
+        self.service.translate_batch(['text 1234567', 'text 7654321'], ['hi'])
+
+        self.assertEqual(self.backend.translate.call_count, 2)
+
+    def test_cached_and_duplicate_texts_not_resent(self):
+        """Test 4: Cached and repeated texts cost no extra requests"""
+        self.service.translate_batch(['text a'], ['hi'])
+        self.backend.translate.reset_mock()
+
+        results = self.service.translate_batch(['text a', 'text b', 'text b'], ['hi'])
+
+        self.assertEqual(self.backend.translate.call_count, 1)
+        self.backend.translate.assert_called_with('text b', 'hi')
+        self.assertEqual([r['hi'] for r in results], ['hi-text a', 'hi-text b', 'hi-text b'])
+
+    def test_falls_back_when_separator_lost(self):
+        """Test 5: Individual requests are used if the batch cannot be split"""
+        self.backend.translate.side_effect = lambda text, target_lang: text.replace(
+            TranslationService.BATCH_SPLIT_TOKEN, ''
+        )
+
+        results = self.service.translate_batch(['first', 'second'], ['hi'])
+
+        self.assertEqual(self.backend.translate.call_count, 3)
+        self.assertEqual([r['hi'] for r in results], ['first', 'second'])
+
+    @override_settings(TRANSLATION_CONCURRENCY=2)
+    def test_languages_are_translated_concurrently(self):
+        """Test 6: Requests for different languages are in flight at the same time"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def translate(text, target_lang):
+            barrier.wait()
+            return fake_translate(text, target_lang)
+
+        self.backend.translate.side_effect = translate
+        results = self.service.translate_batch(['text a'], ['hi', 'bn'])
+
+        self.assertEqual(results, [{'hi': 'hi-text a', 'bn': 'bn-text a'}])
+
+
+class TestTranslationMemory(MockBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend.translate.side_effect = fake_translate
+        self.service = TranslationService()
+
+    def test_memory_survives_cache_flush(self):
+        """Test 1: Stored translations are reused after the cache is cleared"""
+        self.service.translate_text('text to keep', 'hi')
+        cache.clear()
+        self.backend.translate.reset_mock()
+
+        self.assertEqual(self.service.translate_text('text to keep', 'hi'), 'hi-text to keep')
+        self.backend.translate.assert_not_called()
+
+    def test_shared_prefix_does_not_collide(self):
+        """Test 2: Texts with the same opening get their own entries"""
+        prefix = 'text ' * 20
+        first = self.service.translate_text(prefix + 'ending one', 'hi')
+        second = self.service.translate_text(prefix + 'ending two', 'hi')
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(TranslationMemory.objects.count(), 2)
+
+    def test_hits_are_counted(self):
+        """Test 3: Reuses are counted in memory and written in one batch"""
+        self.service.translate_text('text counted', 'bn')
+        with self.assertNumQueries(0):
+            self.service.translate_text('text counted', 'bn')
+            self.service.translate_text('text counted', 'bn')
+
+        self.assertEqual(TranslationMemory.objects.get(target_lang='bn').hit_count, 0)
+        TranslationService.flush_memory_hits()
+        entry = TranslationMemory.objects.get(target_lang='bn')
+        self.assertEqual(entry.hit_count, 2)
+        self.assertEqual(entry.provider, 'mock')
+
+
+@override_settings(TRANSLATION_ASYNC=False)
+class TestIncrementalRetranslation(MockBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend.translate.side_effect = fake_translate
+
+    def test_split_blocks_round_trips(self):
+        """Test 1: Splitting keeps every character of the original HTML"""
+        html = '<p>text one</p>\n<h2>text two</h2><ul><li>text three</li></ul>tail'
+        blocks = split_blocks(html)
+
+        self.assertEqual(blocks, [
+            '<p>text one</p>', '\n', '<h2>text two</h2>', '<ul><li>text three</li></ul>', 'tail'
+        ])
+        self.assertEqual(''.join(blocks), html)
+
+    def test_only_changed_paragraphs_are_translated(self):
+        """Test 2: Unchanged segments are spliced back without a provider call"""
+        faq = FAQ(question='text question', answer=json.dumps({
+            'delta': {'ops': []},
+            'html': '<p>text first</p><p>text second</p>'
+        }))
+        faq.save()
+        self.backend.translate.reset_mock()
+
+        faq.answer = json.dumps({
+            'delta': {'ops': []},
+            'html': '<p>text first</p><p>text changed</p>'
+        })
+        faq.update_translations(['answer'], ['hi'])
+
+        self.backend.translate.assert_called_once_with('text changed', 'hi')
+        self.assertEqual(
+            faq.get_translation('hi').answer.html,
+            '<p>hi-text first</p><p>hi-text changed</p>'
+        )
+
+    def test_delta_follows_stored_segments(self):
+        """Test 3: Delta lines of unchanged paragraphs are taken from the stored segments"""
+        faq = FAQ(question='text question', answer=json.dumps({
+            'delta': {'ops': [{'insert': 'text first\ntext second\n'}]},
+            'html': '<p>text first</p><p>text second</p>'
+        }))
+        faq.save()
+        segments = faq.get_translation('hi').segments
+        segments['answer'][0][1] = '<p>edited first</p>'
+        FAQTranslation.objects.filter(faq=faq, lang='hi').update(segments=segments)
+        faq = FAQ.objects.get(pk=faq.pk)
+        TranslationMemory.objects.all().delete()
+        cache.clear()
+        self.backend.translate.reset_mock()
+
+        faq.answer = json.dumps({
+            'delta': {'ops': [{'insert': 'text first\ntext changed\n'}]},
+            'html': '<p>text first</p><p>text changed</p>'
+        })
+        faq.update_translations(['answer'], ['hi'])
+
+        self.backend.translate.assert_called_once_with('text changed', 'hi')
+        answer = faq.get_translation('hi').answer
+        self.assertEqual(answer.html, '<p>edited first</p><p>hi-text changed</p>')
+        self.assertEqual(
+            json.loads(answer.delta), {'ops': [{'insert': 'edited first\nhi-text changed\n'}]}
+        )
+
+
+@override_settings(TRANSLATION_ASYNC=False)
+class TestStructureAwareTranslation(MockBackendTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend.translate.side_effect = fake_translate
+
+    def test_markup_is_not_sent(self):
+        """Test 1: Only text between tags reaches the provider"""
+        html = '<p>text <strong>bold</strong> &amp; more text</p><p><br></p>'
+
+        translated = TranslationService().translate_html(html, 'hi')
+
+        sent = ''.join(call.args[0] for call in self.backend.translate.call_args_list)
+        self.assertNotIn('<', sent)
+        self.assertEqual(
+            translated, '<p>hi-text <strong>bold</strong> &amp; more hi-text</p><p><br></p>'
+        )
+
+    def test_delta_keeps_formatting(self):
+        """Test 2: The translated delta keeps the attributes of the source ops"""
+        delta = {'ops': [
+            {'insert': 'text '},
+            {'insert': 'bold', 'attributes': {'bold': True}},
+            {'insert': '\nsecond text\n'},
+        ]}
+        faq = FAQ(question='text question', answer=json.dumps({
+            'delta': json.dumps(delta),
+            'html': '<p>text <strong>bold</strong></p><p>second text</p>'
+        }))
+        faq.save()
+
+        self.assertEqual(json.loads(faq.get_translation('bn').answer.delta), {'ops': [
+            {'insert': 'bn-text '},
+            {'insert': 'bold', 'attributes': {'bold': True}},
+            {'insert': '\nsecond bn-text\n'},
+        ]})
+        self.assertEqual(faq.get_translation('bn').answer.html, '<p>bn-text <strong>bold</strong></p><p>second bn-text</p>')
+
+    def test_sanitize_keeps_editor_markup(self):
+        """Test 3: Rendering keeps Quill markup and drops scripts and unsafe URLs"""
+        html = (
+            '<p class="ql-align-center" onclick="x()">A &amp; B</p>'
+            '<a href="java\tscript:alert(1)">bad</a><a href="https://example.com">ok</a>'
+            '<iframe src="x">frame</iframe><ol><li>open'
+        )
+
+        self.assertEqual(sanitize_html(html), (
+            '<p class="ql-align-center">A &amp; B</p>'
+            '<a>bad</a><a href="https://example.com">ok</a><ol><li>open</li></ol>'
+        ))
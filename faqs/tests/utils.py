@@ -0,0 +1,37 @@
+import json
+import time
+from collections import Counter
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from faqs.services import TranslationService
+
+
+def make_answer(html):
+    """Stored Quill value of an answer, as the editor saves it"""
+    return json.dumps({'delta': json.dumps({'ops': [{'insert': html}]}), 'html': html})
+
+
+class MockBackendTestCase(TestCase):
+    """
+    Translations go to `self.backend`, a mock returning '<lang>:<text>'
+
+    Each test starts with an empty cache, a fresh rate limiter and circuit
+    breaker, and no uncounted translation memory hits.
+    """
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.backend = mock.Mock()
+        self.backend.name = 'mock'
+        self.backend.translate.side_effect = lambda text, target_lang: f'{target_lang}:{text}'
+        for patcher in (
+            mock.patch('faqs.services.get_backend', return_value=self.backend),
+            mock.patch.object(TranslationService, '_provider', None),
+            mock.patch.object(TranslationService, '_pending_hits', Counter()),
+            mock.patch.object(TranslationService, '_hits_flushed_at', time.monotonic()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
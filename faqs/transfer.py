@@ -0,0 +1,347 @@
+from collections import defaultdict
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.html import strip_tags
+from itertools import islice
+from typing import Dict, IO, Iterable, Iterator, List
+from .models import FAQ, FAQTranslation, TranslationJob
+from .serializers import datetime_formatter
+from .services import TranslationService
+import csv
+import json
+
+FORMATS = ('jsonl', 'csv')
+EXPORT_FIELDS = ['id', 'external_key', 'question', 'answer', 'is_active', 'auto_translate']
+TRANSLATED_FIELDS = ('question', 'answer')
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'f', 'no', 'n'}
+
+
+class RecordError(ValueError):
+    """A record that cannot be imported"""
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of up to size items without reading further ahead"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def guess_format(path: str, default: str = 'jsonl') -> str:
+    """Pick the format from a file extension"""
+    return 'csv' if path.lower().endswith('.csv') else default
+
+
+def to_bool(value, default: bool) -> bool:
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise RecordError(f"Not a boolean: {value!r}")
+
+
+def to_pk(value):
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RecordError(f"Not an id: {value!r}")
+
+
+def to_quill_json(value) -> str:
+    """
+    Return the stored Quill JSON for an answer
+
+    Accepts the exported Quill value (as a string or an object) or plain
+    HTML, which gets a matching plain-text delta.
+    """
+    data = value
+    if isinstance(value, str):
+        try:
+            data = json.loads(value)
+        except ValueError:
+            data = None
+    if isinstance(data, dict) and 'html' in data:
+        delta = data.get('delta') or ''
+        if not isinstance(delta, str):
+            delta = json.dumps(delta, ensure_ascii=False)
+        return json.dumps({'delta': delta, 'html': data['html']}, ensure_ascii=False)
+
+    html = str(value or '')
+    delta = {"ops": [{"insert": f"{strip_tags(html)}\n"}]}
+    return json.dumps(
+        {'delta': json.dumps(delta, ensure_ascii=False), 'html': html}, ensure_ascii=False
+    )
+
+
+def _record_from_csv(row: Dict[str, str]) -> dict:
+    """Turn a CSV row with question_<lang>/answer_<lang> columns into a record"""
+    record = {'translations': {}}
+    for column, value in row.items():
+        field, _, lang = column.partition('_')
+        if field in TRANSLATED_FIELDS and lang:
+            if value:
+                record['translations'].setdefault(lang, {})[field] = value
+        elif value != '':
+            record[column] = value
+    return record
+
+
+def _record_to_csv(record: dict) -> dict:
+    row = {field: record[field] for field in EXPORT_FIELDS}
+    for lang, values in record['translations'].items():
+        for field in TRANSLATED_FIELDS:
+            row[f'{field}_{lang}'] = values.get(field) or ''
+    return row
+
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[dict]:
+    """Parse records from a JSON Lines or CSV stream one at a time"""
+    if fmt == 'csv':
+        for row in csv.DictReader(stream):
+            yield _record_from_csv(row)
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise RecordError(f"Line {line_number}: invalid JSON ({e})")
+
+
+def export_records(queryset, chunk_size: int = 1000) -> Iterator[dict]:
+    """
+    Yield FAQs as plain records, reading chunk_size rows at a time
+
+    Translations for each chunk are read with one extra query.
+    """
+    rows = queryset.order_by('pk').values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    for chunk in chunked(rows, chunk_size):
+        translations = defaultdict(dict)
+        for row in FAQTranslation.objects.filter(
+            faq_id__in=[row['id'] for row in chunk]
+        ).values('faq_id', 'lang', 'question', 'answer'):
+            translations[row['faq_id']][row['lang']] = {
+                'question': row['question'],
+                'answer': row['answer'],
+            }
+        for row in chunk:
+            row['translations'] = translations.get(row['id'], {})
+            yield row
+
+
+def feed_records(queryset, languages: List[str], chunk_size: int = 1000) -> Iterator[dict]:
+    """
+    Yield FAQs with their question and answer HTML in every language
+
+    Each language holds the text as the list endpoint serves it, English
+    where a translation is missing or empty. Translations for each chunk
+    are read with one extra query.
+    """
+    format_datetime = datetime_formatter()
+    rows = queryset.order_by('pk').values(
+        'id', 'question', 'answer_html', 'created_at', 'updated_at'
+    ).iterator(chunk_size=chunk_size)
+    for chunk in chunked(rows, chunk_size):
+        translations = {
+            (faq_id, lang): (question, answer)
+            for faq_id, lang, question, answer in FAQTranslation.objects.filter(
+                faq_id__in=[row['id'] for row in chunk],
+                lang__in=[lang for lang in languages if lang != 'en']
+            ).order_by().values_list('faq_id', 'lang', 'question', 'answer_html')
+        }
+        for row in chunk:
+            record = {
+                'id': row['id'],
+                'created_at': format_datetime(row['created_at']),
+                'updated_at': format_datetime(row['updated_at']),
+                'languages': {},
+            }
+            for lang in languages:
+                question, answer = translations.get((row['id'], lang), (None, None))
+                record['languages'][lang] = {
+                    'question': question or row['question'],
+                    'answer': answer or row['answer_html'],
+                }
+            yield record
+
+
+def write_records(stream: IO[str], records: Iterable[dict], fmt: str) -> int:
+    """Write records as JSON Lines or CSV as they arrive; returns the count"""
+    count = 0
+    if fmt == 'csv':
+        languages = TranslationService.get_target_languages()
+        writer = csv.DictWriter(
+            stream,
+            fieldnames=EXPORT_FIELDS + [
+                f'{field}_{lang}' for lang in languages for field in TRANSLATED_FIELDS
+            ],
+            extrasaction='ignore'
+        )
+        writer.writeheader()
+        for record in records:
+            writer.writerow(_record_to_csv(record))
+            count += 1
+        return count
+
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+class FAQImporter:
+    """
+    Creates and updates FAQs from records with a few bulk queries per chunk
+
+    Records are matched to existing FAQs by id, else by external_key.
+
+    Each chunk is written in its own transaction. Translation is not run
+    inline: jobs for the changed fields are queued for the translation
+    worker, one bulk insert per chunk. Languages supplied in a record are
+    stored as they are and not queued.
+    """
+    UPDATE_FIELDS = [
+        'external_key', 'question', 'answer', 'answer_html', 'is_active', 'auto_translate',
+        'updated_at'
+    ]
+
+    def __init__(self, chunk_size: int = 1000, queue_translations: bool = True):
+        self.chunk_size = chunk_size
+        self.queue_translations = queue_translations
+        self.created = 0
+        self.updated = 0
+        self.queued = 0
+        self._explicit_ids = False
+
+    def run(self, records: Iterable[dict]) -> 'FAQImporter':
+        for index, chunk in enumerate(chunked(records, self.chunk_size)):
+            self.import_chunk(chunk, start=index * self.chunk_size + 1)
+        if self._explicit_ids:
+            self._reset_sequences()
+        return self
+
+    def _apply(self, faq: FAQ, record: dict) -> None:
+        if not isinstance(record, dict) or not record.get('question'):
+            raise RecordError(f"Record without a question: {record!r:.100}")
+        if 'external_key' in record:
+            faq.external_key = record['external_key'] or None
+        faq.question = record['question']
+        faq.answer = to_quill_json(record.get('answer', ''))
+        faq.is_active = to_bool(record.get('is_active'), faq.is_active)
+        faq.auto_translate = to_bool(record.get('auto_translate'), faq.auto_translate)
+
+    def _build_translations(self, faq: FAQ, record: dict, now) -> List[FAQTranslation]:
+        translations = []
+        for lang, values in (record.get('translations') or {}).items():
+            answer = values.get('answer')
+            translations.append(FAQTranslation(
+                faq=faq,
+                lang=lang,
+                question=values.get('question'),
+                answer=to_quill_json(answer) if answer else None,
+                source_hash=faq.get_source_hash(),
+                translated_at=now,
+            ))
+        return translations
+
+    @staticmethod
+    def _check_identity(faq: FAQ, by_key: Dict[str, FAQ], seen_ids: set, seen_keys: set) -> None:
+        """Reject a record whose FAQ or external_key another record or FAQ already has"""
+        if faq.pk is not None:
+            if faq.pk in seen_ids:
+                raise RecordError(f"FAQ {faq.pk} appears more than once in the chunk")
+            seen_ids.add(faq.pk)
+        key = faq.external_key
+        if key:
+            if key in seen_keys:
+                raise RecordError(f"external_key {key!r} appears more than once in the chunk")
+            owner = by_key.get(key)
+            if owner is not None and owner.pk != faq.pk:
+                raise RecordError(f"external_key {key!r} belongs to FAQ {owner.pk}")
+            seen_keys.add(key)
+
+    def import_chunk(self, records: List[dict], start: int = 1) -> None:
+        """
+        Write one chunk of records; start is the number of its first record
+
+        A record that is invalid, names the same FAQ or external_key as an
+        earlier record in the chunk, or takes another FAQ's external_key
+        raises RecordError with its number and nothing in the chunk is written.
+        """
+        existing = FAQ.objects.in_bulk([
+            pk for pk in (to_pk(record.get('id')) for record in records) if pk is not None
+        ])
+        keys = [record['external_key'] for record in records if record.get('external_key')]
+        by_key = FAQ.objects.in_bulk(keys, field_name='external_key') if keys else {}
+        target_languages = TranslationService.get_target_languages()
+        now = timezone.now()
+
+        new_faqs, updated_faqs, translations = [], {}, []
+        jobs = defaultdict(list)
+        seen_ids, seen_keys = set(), set()
+        for number, record in enumerate(records, start=start):
+            try:
+                pk = to_pk(record.get('id'))
+                faq = existing.get(pk) or by_key.get(record.get('external_key')) or FAQ(pk=pk)
+                self._apply(faq, record)
+                self._check_identity(faq, by_key, seen_ids, seen_keys)
+            except RecordError as e:
+                raise RecordError(f"Record {number}: {e}")
+
+            changed_fields = faq.get_changed_source_fields()
+            if 'answer' in changed_fields:
+                faq.render_answer()
+            if faq._state.adding:
+                self._explicit_ids = self._explicit_ids or pk is not None
+                new_faqs.append(faq)
+            else:
+                faq.updated_at = now
+                updated_faqs[faq.pk] = faq
+
+            supplied = self._build_translations(faq, record, now)
+            translations.extend(supplied)
+            languages = tuple(
+                lang for lang in target_languages
+                if lang not in {translation.lang for translation in supplied}
+            )
+            if faq.auto_translate and changed_fields and languages:
+                jobs[(tuple(changed_fields), languages)].append(faq)
+
+        with transaction.atomic():
+            FAQ.objects.bulk_create(new_faqs)
+            # An upsert on the primary key is far cheaper than bulk_update's CASE chains
+            FAQ.objects.bulk_create(
+                updated_faqs.values(),
+                update_conflicts=True,
+                unique_fields=['id'],
+                update_fields=self.UPDATE_FIELDS
+            )
+            FAQTranslation.upsert(translations)
+            if self.queue_translations:
+                for (fields, languages), faqs in jobs.items():
+                    TranslationJob.enqueue(faqs, list(fields), list(languages))
+                    self.queued += len(faqs) * len(fields) * len(languages)
+
+        self.created += len(new_faqs)
+        self.updated += len(updated_faqs)
+
+    def _reset_sequences(self) -> None:
+        """Move the id sequence past ids that were inserted explicitly"""
+        statements = connection.ops.sequence_reset_sql(no_style(), [FAQ])
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
@@ -0,0 +1,57 @@
+from typing import Dict, Iterable, Optional
+from .caching import cache_set_many, get_generation, list_cache_key, page_cache_key, store_built
+from .models import FAQ
+from .pagination import FAQCursorPagination
+from .rendering import build_page, render_language
+from .services import TranslationService
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def warm_cache(languages: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Fill the FAQ cache for every language with two queries per language
+
+    Writes each language's list, which by_language is also served from, the
+    default first page of the list endpoint, and the translated fields read
+    by the detail endpoint, with one bulk write per kind. Returns the
+    seconds spent reading, rendering and writing, and the number of entries
+    written.
+    """
+    languages = list(languages or TranslationService.get_languages())
+    page_size = FAQCursorPagination().page_size
+    generation = get_generation()
+    timings = {'read': 0.0, 'render': 0.0, 'write': 0.0}
+
+    built, fields = {}, {}
+    for lang in languages:
+        started = time.monotonic()
+        rows = list(FAQ.objects.filter(is_active=True).for_language(lang))
+        timings['read'] += time.monotonic() - started
+
+        started = time.monotonic()
+        built[list_cache_key(lang)] = render_language(rows)
+        # The first page reads its own rows, a query that is timed as rendering
+        built[page_cache_key(lang, None, page_size)] = build_page(lang, None, page_size)
+        for row in rows:
+            faq = FAQ(pk=row['id'])
+            for field, value in (
+                ('question', row['translated_question']),
+                ('answer_html', row['translated_answer']),
+            ):
+                if value is not None:
+                    fields[faq._get_cache_key(field, lang)] = value
+        timings['render'] += time.monotonic() - started
+
+    started = time.monotonic()
+    store_built(built, generation=generation)
+    cache_set_many(fields, generation=generation)
+    timings['write'] = time.monotonic() - started
+
+    timings['entries'] = len(built) + len(fields)
+    logger.info(
+        f"Warmed {timings['entries']} FAQ cache entries for {len(languages)} languages"
+    )
+    return timings